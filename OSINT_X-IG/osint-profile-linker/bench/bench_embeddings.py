@@ -0,0 +1,115 @@
+"""
+Embedding backends for features.embed_text: cold start (import + model load),
+first-call latency, encode throughput and peak RSS for each backend, each in
+a fresh process, plus how far its embeddings drift from fp32 torch.
+
+    python bench/bench_embeddings.py --texts 2000 --batch 64
+    python bench/bench_embeddings.py --backends torch onnx-int8
+
+onnx and onnx-int8 need sentence-transformers>=3.2 with its onnx extra.
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+WORDS = ("photo travel coffee code music runner design dad mum cats football "
+         "london mumbai founder engineer student art film books gym vegan sunset "
+         "startup python cricket climbing nyc berlin family podcast gamer chef").split()
+
+
+def make_texts(n: int, seed: int):
+    rng = random.Random(seed)
+    return [" ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 40))) for _ in range(n)]
+
+
+def child(args):
+    # One backend, one process: nothing loaded before the clock starts
+    t0 = time.perf_counter()
+    import features
+    import_s = time.perf_counter() - t0
+    import numpy as np
+
+    t0 = time.perf_counter()
+    features.get_model(args.child)
+    load_s = time.perf_counter() - t0
+
+    texts = make_texts(args.texts, args.seed)
+    t0 = time.perf_counter()
+    features.embed_text(texts[:1], backend=args.child)
+    first_s = time.perf_counter() - t0
+
+    model = features.get_model(args.child)
+    t0 = time.perf_counter()
+    emb = model.encode(texts, batch_size=args.batch, convert_to_numpy=True)
+    encode_s = time.perf_counter() - t0
+
+    np.save(args.out, emb)
+    print(json.dumps({
+        "import_s": import_s, "load_s": load_s, "first_s": first_s,
+        "per_s": len(texts) / encode_s,
+        "rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+    }))
+
+
+def unit(m):
+    import numpy as np
+    return m / np.linalg.norm(m, axis=1, keepdims=True)
+
+
+def main():
+    sys.path.insert(0, SRC)
+    from config import EMBED_BACKENDS, EMBED_TOLERANCE  # config only: features stays unimported
+
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--backends", nargs="+", default=list(EMBED_BACKENDS), choices=EMBED_BACKENDS)
+    ap.add_argument("--texts", type=int, default=2000)
+    ap.add_argument("--batch", type=int, default=64)
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--child", help=argparse.SUPPRESS)
+    ap.add_argument("--out", help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return child(args)
+
+    import numpy as np
+
+    backends = ["torch"] + [b for b in args.backends if b != "torch"]  # fp32 is the reference
+    tmp = tempfile.mkdtemp(prefix="bench_embeddings_")
+    ref = None
+    for backend in backends:
+        out = os.path.join(tmp, f"{backend}.npy")
+        t0 = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", backend, "--out", out,
+             "--texts", str(args.texts), "--batch", str(args.batch), "--seed", str(args.seed)],
+            capture_output=True, text=True)
+        wall_s = time.perf_counter() - t0
+        if proc.returncode:
+            print(f"{backend:<11} failed: {proc.stderr.strip().splitlines()[-1]}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        emb = unit(np.load(out))
+        if backend == "torch":
+            ref = emb
+        drift = ""
+        if ref is not None:
+            cos = (emb * ref).sum(axis=1)
+            # what matcher sees: pairwise similarities, here each text against the next
+            dsim = np.abs((emb[:-1] * emb[1:]).sum(axis=1) - (ref[:-1] * ref[1:]).sum(axis=1))
+            drift = (f"  cos vs fp32 min {cos.min():.4f}  max |dsim| {dsim.max():.4f}  "
+                     f"{'ok' if 1 - cos.min() <= EMBED_TOLERANCE else 'OUT OF TOLERANCE'}")
+        print(f"{backend:<11} import {1000 * r['import_s']:6.0f} ms  load {r['load_s']:5.2f} s  "
+              f"first {1000 * r['first_s']:6.1f} ms  encode {r['per_s']:7.1f} texts/s  "
+              f"rss {r['rss_mb']:6.0f} MB  process {wall_s:5.1f} s{drift}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,6 @@
 # config.py
+import os
+
 WEIGHTS = {
     "username": 0.25,
     "display_name": 0.20,
@@ -11,3 +13,11 @@ WEIGHTS = {
 API_BASE = "https://api.x.com/2"  # replace with correct X endpoint if needed
 MAX_PERMUTATIONS = 50
 CACHE_DIR = "../data/cached_samples"
+
+# Sentence-embedding model, loaded on first use (features.get_model)
+EMBED_MODEL = os.getenv("EMBED_MODEL", "all-MiniLM-L6-v2")
+EMBED_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+EMBED_BACKEND = os.getenv("EMBED_BACKEND", "torch")
+EMBED_DEVICE = os.getenv("EMBED_DEVICE") or None  # fp32 torch only; unset lets torch pick CUDA when present
+ONNX_INT8_FILE = os.getenv("ONNX_INT8_FILE", "onnx/model_quint8_avx2.onnx")  # quantized export in the model repo
+EMBED_TOLERANCE = 0.02  # a backend's embeddings must stay within 1 - cosine of this of fp32 torch
@@ -1,5 +1,5 @@
 # features.py
-from sentence_transformers import SentenceTransformer
+import threading
 import numpy as np
 from PIL import Image
 import imagehash
@@ -7,12 +7,45 @@ import requests
 from io import BytesIO
 import difflib
 from sklearn.metrics.pairwise import cosine_similarity
+from config import EMBED_BACKEND, EMBED_BACKENDS, EMBED_DEVICE, EMBED_MODEL, ONNX_INT8_FILE
 
-MODEL = SentenceTransformer("all-MiniLM-L6-v2")
+_models = {}
+_models_lock = threading.Lock()
 
-def embed_text(texts):
+def load_model(backend=EMBED_BACKEND, name=EMBED_MODEL):
+    """Build a fresh SentenceTransformer for `backend`; use get_model() for the shared one."""
+    if backend not in EMBED_BACKENDS:
+        raise ValueError(f"unknown embedding backend {backend!r}, expected one of {EMBED_BACKENDS}")
+    # imported here so importing features/matcher doesn't pay for torch
+    from sentence_transformers import SentenceTransformer
+    if backend.startswith("onnx"):
+        kwargs = {"file_name": ONNX_INT8_FILE} if backend == "onnx-int8" else {}
+        try:
+            return SentenceTransformer(name, device="cpu", backend="onnx", model_kwargs=kwargs)
+        except (TypeError, ImportError) as e:
+            raise ImportError(f"EMBED_BACKEND={backend} needs sentence-transformers>=3.2 with "
+                              f"onnxruntime: pip install 'sentence-transformers[onnx]'") from e
+    if backend == "torch":
+        return SentenceTransformer(name, device=EMBED_DEVICE)
+    import torch
+    # torch-int8: dynamic quantization only has CPU kernels; int8 weights for
+    # every Linear layer, activations quantized on the fly
+    model = SentenceTransformer(name, device="cpu")
+    return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def get_model(backend=EMBED_BACKEND):
+    """The process-wide model for `backend`, loaded on first call."""
+    model = _models.get(backend)
+    if model is None:
+        with _models_lock:
+            model = _models.get(backend)
+            if model is None:
+                model = _models[backend] = load_model(backend)
+    return model
+
+def embed_text(texts, backend=EMBED_BACKEND):
     # texts: list of strings
-    return MODEL.encode(texts, convert_to_numpy=True)
+    return get_model(backend).encode(texts, convert_to_numpy=True)
 
 def cosine_sim(a, b):
     if a is None or b is None: return 0.0
@@ -1,48 +1,44 @@
-from flask import Flask, jsonify 
-
-from services.collectors.github_collector import fetch_github_profile
-from services.collectors.reddit_collector import fetch_reddit_profile
-from services.collectors.devto_collector import fetch_devto_profile
-from services.collectors.search_collector import search_social_links
 import os
+from contextlib import asynccontextmanager
 
+import uvicorn
+from dotenv import load_dotenv
+from fastapi import FastAPI
 
-app = Flask(__name__)
-
-# Health check
-@app.route("/")
-def home():
-    return jsonify({"status": "ok", "message": "Social OSINT API running!"})
+load_dotenv()
 
+from services.discovery import DiscoveryService  # noqa: E402
+from services.utils import create_client  # noqa: E402
 
-# Main search route
-@app.route("/search/<username>", methods=["GET"])
-def search_username(username):
-    results = {}
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client for the whole process; every collector shares it
+    client = create_client()
+    app.state.discovery = DiscoveryService(client=client)
     try:
-        results["github"] = fetch_github_profile(username)
-    except Exception as e:
-        results["github"] = {"error": str(e)}
+        yield
+    finally:
+        app.state.discovery.close()
+        await client.aclose()
 
-    try:
-        results["reddit"] = fetch_reddit_profile(username)
-    except Exception as e:
-        results["reddit"] = {"error": str(e)}
 
-    try:
-        results["devto"] = fetch_devto_profile(username)
-    except Exception as e:
-        results["devto"] = {"error": str(e)}
+app = FastAPI(title="Social OSINT API", lifespan=lifespan)
 
-    try:
-        results["social_links"] = search_social_links(username)
-    except Exception as e:
-        results["social_links"] = {"error": str(e)}
 
-    return jsonify({"username": username, "results": results})
+# Health check
+@app.get("/")
+async def home():
+    return {"status": "ok", "message": "Social OSINT API running!"}
+
+
+# Main search route
+@app.get("/search/{username}")
+async def search_username(username: str):
+    results = await app.state.discovery.find_user(username)
+    return {"username": username, "results": results}
 
 
 if __name__ == "__main__":
-    # Run on http://127.0.0.1:5000
-    app.run(debug=True)
+    # Run on http://127.0.0.1:8000
+    uvicorn.run(app, host=os.getenv("APP_HOST", "127.0.0.1"), port=int(os.getenv("APP_PORT", "8000")))
@@ -0,0 +1,64 @@
+"""
+Near-duplicate avatar lookup: multi-index hash queries versus a linear Hamming
+scan over --hashes random 64-bit perceptual hashes, a share of which are
+near-copies (a few flipped bits) of others. Checks both return the same set.
+
+    python -m bench.bench_avatars --hashes 200000 --queries 500 --radius 6
+"""
+import argparse
+import random
+import time
+
+from core.hashindex import HashIndex, hamming
+from core.scoring import AVATAR_RADIUS
+
+
+def make_hashes(n: int, seed: int):
+    rng = random.Random(seed)
+    out = []
+    for k in range(n):
+        if out and rng.random() < 0.2:
+            h = rng.choice(out)
+            for bit in rng.sample(range(64), rng.randint(1, 8)):
+                h ^= 1 << bit
+        else:
+            h = rng.getrandbits(64)
+        out.append(h)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--hashes", type=int, default=200_000)
+    ap.add_argument("--queries", type=int, default=500)
+    ap.add_argument("--radius", type=int, default=AVATAR_RADIUS)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    hashes = make_hashes(args.hashes, args.seed)
+    queries = random.Random(args.seed + 1).sample(hashes, args.queries)
+
+    t0 = time.perf_counter()
+    index = HashIndex(args.radius)
+    for k, h in enumerate(hashes):
+        index.add(h, k)
+    build_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    fast = [sorted(k for k, _ in index.query(q)) for q in queries]
+    index_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    slow = [[k for k, h in enumerate(hashes) if hamming(q, h) <= args.radius] for q in queries]
+    scan_s = time.perf_counter() - t0
+
+    hits = sum(len(r) for r in fast)
+    print(f"hashes {len(hashes)}  queries {len(queries)}  radius {args.radius}  "
+          f"matches {hits}  same {fast == slow}")
+    print(f"index build   {build_s:6.2f} s   query {1000 * index_s / len(queries):8.3f} ms")
+    print(f"linear scan                query {1000 * scan_s / len(queries):8.3f} ms   "
+          f"speedup {scan_s / index_s:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+build_clusters: the previous DFS + linear match scan versus union-find with an
+indexed edge map, on synthetic match graphs (people with 1-4 accounts whose
+pairs score above EDGE_THRESHOLD, plus a few low-scoring noise pairs per
+profile). The old version is only run up to --legacy-max profiles.
+
+    python -m bench.bench_clusters --sizes 1000 10000 50000
+"""
+import argparse
+import random
+import time
+
+from core.models import Cluster, PairScores, ProfileEvidence, ProfileMatch
+from core.scoring import EDGE_THRESHOLD, build_clusters
+
+
+def legacy_build_clusters(profiles, matches):
+    # The previous build_clusters: DFS, then a scan of every match per member pair
+    n = len(profiles)
+    adj = {i: set() for i in range(n)}
+    for m in matches:
+        if m.scores.total >= EDGE_THRESHOLD:
+            adj[m.i].add(m.j)
+            adj[m.j].add(m.i)
+    seen = set()
+    clusters = []
+    for i in range(n):
+        if i in seen:
+            continue
+        stack, comp = [i], []
+        while stack:
+            u = stack.pop()
+            if u in seen:
+                continue
+            seen.add(u)
+            comp.append(u)
+            stack.extend(v for v in adj[u] if v not in seen)
+        if len(comp) == 1:
+            conf = profiles[comp[0]].confidence_local * 100.0
+        else:
+            edges = []
+            for a in range(len(comp)):
+                for b in range(a + 1, len(comp)):
+                    x, y = comp[a], comp[b]
+                    sc = next((m.scores.total for m in matches
+                               if (m.i == x and m.j == y) or (m.i == y and m.j == x)), 0.0)
+                    edges.append(sc)
+            conf = sum(edges) / len(edges) if edges else 0.0
+        clusters.append(Cluster(profile_indices=comp, cluster_confidence=conf))
+    return clusters
+
+
+def make_graph(n: int, noise_per_profile: int, seed: int):
+    rng = random.Random(seed)
+    profiles = [ProfileEvidence(platform="x", confidence_local=rng.uniform(0.3, 0.9)) for _ in range(n)]
+    order = list(range(n))
+    rng.shuffle(order)
+    matches = []
+    k = 0
+    while k < n:
+        group = order[k:k + rng.randint(1, 4)]
+        k += len(group)
+        for a in range(len(group)):
+            for b in range(a + 1, len(group)):
+                i, j = sorted((group[a], group[b]))
+                matches.append(ProfileMatch(i=i, j=j, scores=PairScores(total=rng.uniform(EDGE_THRESHOLD, 95))))
+    seen = {(m.i, m.j) for m in matches}  # build_matches scores each pair once
+    for _ in range(n * noise_per_profile):
+        i, j = sorted(rng.sample(range(n), 2))
+        if (i, j) in seen:
+            continue
+        seen.add((i, j))
+        matches.append(ProfileMatch(i=i, j=j, scores=PairScores(total=rng.uniform(10, EDGE_THRESHOLD - 1))))
+    return profiles, matches
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    out = fn(*args)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    ap.add_argument("--noise", type=int, default=3, help="low-scoring pairs per profile")
+    ap.add_argument("--legacy-max", type=int, default=10000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    for n in args.sizes:
+        profiles, matches = make_graph(n, args.noise, args.seed)
+        new, new_s = timed(build_clusters, profiles, matches)
+        line = f"n={n:<6} matches {len(matches):>7}  clusters {len(new):>6}  union-find {new_s * 1000:9.1f} ms"
+        if n <= args.legacy_max:
+            old, old_s = timed(legacy_build_clusters, profiles, matches)
+            same = sorted(sorted(c.profile_indices) for c in old) == sorted(c.profile_indices for c in new)
+            line += f"  legacy {old_s * 1000:10.1f} ms  ({old_s / new_s:6.0f}x)  same clusters {same}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Wall time of DiscoveryService.find_user: the old one-after-another loop versus
+the concurrent engine, using stand-in collectors with fixed latencies (no
+network). Mixes blocking and async collectors, like the real registry.
+
+    python -m bench.bench_discovery --rounds 5
+"""
+import argparse
+import asyncio
+import time
+
+from services.collectors.registry import CollectorSpec
+from services.discovery import DiscoveryService
+
+LATENCIES = {
+    "github": 0.30,
+    "reddit": 0.80,
+    "devto": 0.25,
+    "codeforces": 0.40,
+    "stackoverflow": 0.05,
+    "social_links": 0.60,
+}
+
+
+def blocking(name, delay):
+    def collect(username):
+        time.sleep(delay)
+        return {"platform": name, "username": username}
+    return collect
+
+
+def non_blocking(name, delay):
+    async def collect(username):
+        await asyncio.sleep(delay)
+        return {"platform": name, "username": username}
+    return collect
+
+
+def stand_ins():
+    specs = {}
+    for i, (name, delay) in enumerate(LATENCIES.items()):
+        make = blocking if i % 2 == 0 else non_blocking
+        specs[name] = CollectorSpec(name, make(name, delay))
+    return specs
+
+
+def sequential(specs, username):
+    # The previous find_user: each collector waits for the one before it
+    results = {}
+    for name, spec in specs.items():
+        fn = spec.fn
+        data = asyncio.run(fn(username)) if asyncio.iscoroutinefunction(fn) else fn(username)
+        if data:
+            results[name] = data
+    return results
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rounds", type=int, default=5)
+    args = ap.parse_args()
+
+    specs = stand_ins()
+    service = DiscoveryService(collectors=specs)
+    print(f"collectors: {len(specs)}   sum {sum(LATENCIES.values()):.2f} s   "
+          f"max {max(LATENCIES.values()):.2f} s")
+    try:
+        for label, run in (
+            ("sequential", lambda u: sequential(specs, u)),
+            ("concurrent", lambda u: asyncio.run(service.find_user(u))),
+        ):
+            times = []
+            for r in range(args.rounds):
+                t = time.perf_counter()
+                found = run(f"user{r}")
+                times.append(time.perf_counter() - t)
+                assert len(found) == len(specs)
+            print(f"{label:<11} mean {sum(times) / len(times):.3f} s   best {min(times):.3f} s")
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    main()
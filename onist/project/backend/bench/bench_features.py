@@ -0,0 +1,67 @@
+"""
+Pair scoring throughput: the previous score_pair, which normalized both
+profiles on every call, versus score_features over ProfileFeatures compiled
+once per profile. Scores every pair of --profiles synthetic profiles.
+
+    python -m bench.bench_features --profiles 300
+"""
+import argparse
+import time
+
+from rapidfuzz import fuzz
+
+from bench.synthetic import make_profiles
+from core.models import PairScores
+from core.scoring import WEIGHTS, jaccard, norm, profile_features, score_features
+
+
+def legacy_score_pair(a, b):
+    # The previous score_pair: every field re-normalized for every pair
+    s = PairScores()
+    s.name = max(fuzz.WRatio(norm(a.display_name), norm(b.display_name)) / 100.0,
+                 fuzz.WRatio(norm(a.handle), norm(b.handle)) / 100.0)
+    s.bio = jaccard(a.bio or "", b.bio or "")
+    s.employer = fuzz.WRatio(norm(a.employer), norm(b.employer)) / 100.0
+    s.education = fuzz.WRatio(norm(a.education), norm(b.education)) / 100.0
+    links_a = set([norm(x) for x in (a.links or [])])
+    links_b = set([norm(x) for x in (b.links or [])])
+    s.links = (len(links_a & links_b) / len(links_a | links_b)) if (links_a or links_b) else 0.0
+    s.location = jaccard(a.location or "", b.location or "")
+    s.avatar = 1.0 if a.avatar_url and b.avatar_url and a.avatar_url == b.avatar_url else 0.0
+    s.email = 1.0 if set(a.emails) & set(b.emails) else 0.0
+    s.phone = 1.0 if set(a.phones) & set(b.phones) else 0.0
+    base = sum(getattr(s, k) * WEIGHTS[k] for k in
+               ("name", "bio", "employer", "education", "links", "location", "avatar"))
+    bonus = (WEIGHTS["email"] if s.email else 0.0) + (WEIGHTS["phone"] if s.phone else 0.0)
+    s.total = min(100.0, (base + bonus) * 100.0)
+    return s
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--profiles", type=int, default=300)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    profiles = make_profiles(args.profiles, args.seed)
+    n = len(profiles)
+    pairs = [(i, j) for i in range(n) for j in range(i + 1, n)]
+
+    t0 = time.perf_counter()
+    old = [legacy_score_pair(profiles[i], profiles[j]).total for i, j in pairs]
+    old_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    feats = [profile_features(p) for p in profiles]
+    new = [score_features(feats[i], feats[j]).total for i, j in pairs]
+    new_s = time.perf_counter() - t0
+
+    worst = max(abs(x - y) for x, y in zip(old, new))
+    print(f"pairs {len(pairs)}")
+    print(f"per-pair normalize   {old_s:6.2f} s   {1e6 * old_s / len(pairs):6.1f} us/pair")
+    print(f"compiled features    {new_s:6.2f} s   {1e6 * new_s / len(pairs):6.1f} us/pair   "
+          f"speedup {old_s / new_s:4.1f}x   max |diff| {worst:g}")
+
+
+if __name__ == "__main__":
+    main()
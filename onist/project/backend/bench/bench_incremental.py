@@ -0,0 +1,47 @@
+"""
+Keeping a case current while evidence streams in: rerunning build_matches +
+build_clusters over the whole case after every arrival versus LiveCase.add.
+Evidence arrives in batches of --batch profiles.
+
+    python -m bench.bench_incremental --profiles 1000 --batch 20
+"""
+import argparse
+import time
+
+from bench.synthetic import make_profiles
+from core.incremental import LiveCase
+from core.scoring import build_clusters, build_matches
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--profiles", type=int, default=1000)
+    ap.add_argument("--batch", type=int, default=20)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    profiles = make_profiles(args.profiles, args.seed)
+    arrivals = [profiles[k:k + args.batch] for k in range(0, len(profiles), args.batch)]
+
+    t0 = time.perf_counter()
+    seen = []
+    for batch in arrivals:
+        seen.extend(batch)
+        clusters = build_clusters(seen, build_matches(seen))
+    rebuild_s = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    live = LiveCase()
+    for batch in arrivals:
+        live.add(batch)
+    live_s = time.perf_counter() - t0
+
+    same = ([c.profile_indices for c in clusters] == [c.profile_indices for c in live.clusters])
+    print(f"{len(profiles)} profiles in {len(arrivals)} arrivals")
+    print(f"full rebuild   {rebuild_s:7.2f} s   {1000 * rebuild_s / len(arrivals):8.1f} ms/arrival")
+    print(f"LiveCase.add   {live_s:7.2f} s   {1000 * live_s / len(arrivals):8.1f} ms/arrival   "
+          f"speedup {rebuild_s / live_s:5.1f}x   same clusters {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Edge finding three ways on synthetic profiles: exhaustive per-pair scoring,
+blocked build_matches, and the cdist/NumPy matrix scorer. Reports time and
+whether each finds the same edges (pairs at or above EDGE_THRESHOLD) as the
+exhaustive run; exhaustive is skipped above --exhaustive-max.
+
+    python -m bench.bench_matrix --sizes 500 2000 5000 --workers -1
+"""
+import argparse
+import time
+
+from bench.synthetic import make_profiles
+from core.matrix import matrix_matches
+from core.scoring import EDGE_THRESHOLD, build_matches
+
+
+def edges(matches):
+    return {(m.i, m.j) for m in matches if m.scores.total >= EDGE_THRESHOLD}
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    out = fn(*args, **kwargs)
+    return out, time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[500, 2000, 5000])
+    ap.add_argument("--workers", type=int, default=-1, help="cdist threads (-1 = all cores)")
+    ap.add_argument("--exhaustive-max", type=int, default=2000)
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    for n in args.sizes:
+        profiles = make_profiles(n, args.seed)
+        matrix, matrix_s = timed(matrix_matches, profiles, workers=args.workers)
+        blocked, blocked_s = timed(build_matches, profiles)
+        line = (f"n={n:<6} edges {len(matrix):>5}  matrix {matrix_s:7.2f} s   "
+                f"blocked {blocked_s:7.2f} s (same {edges(blocked) == edges(matrix)})")
+        if n <= args.exhaustive_max:
+            exhaustive, exhaustive_s = timed(build_matches, profiles, exhaustive=True)
+            line += (f"   exhaustive {exhaustive_s:7.2f} s (same {edges(exhaustive) == edges(matrix)})"
+                     f"   matrix speedup {exhaustive_s / matrix_s:5.1f}x")
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Allocations and peak memory of scoring a case: pydantic PairScores +
+ProfileMatch per pair (build_matches) versus engine-side Match tuples
+(score_candidates), measured with tracemalloc. --exhaustive scores every pair,
+which is where per-pair objects hurt most.
+
+    python -m bench.bench_memory --profiles 3000
+    python -m bench.bench_memory --profiles 800 --exhaustive
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from bench.synthetic import make_profiles
+from core.scoring import build_clusters, build_matches, score_candidates
+
+
+def measure(fn, profiles, exhaustive):
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    matches = fn(profiles, exhaustive)
+    clusters = build_clusters(profiles, matches)
+    elapsed = time.perf_counter() - t0
+    snapshot = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count for stat in snapshot.statistics("filename"))
+    return len(matches), len(clusters), blocks, peak, elapsed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--profiles", type=int, default=3000)
+    ap.add_argument("--exhaustive", action="store_true")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    profiles = make_profiles(args.profiles, args.seed)
+    print(f"profiles {len(profiles)}  {'exhaustive' if args.exhaustive else 'blocked'}  (times include tracemalloc overhead)")
+    for label, fn in (("pydantic per pair", build_matches), ("Match tuples", score_candidates)):
+        pairs, clusters, blocks, peak, elapsed = measure(fn, profiles, args.exhaustive)
+        print(f"{label:<18} pairs {pairs:>8}  clusters {clusters:>6}  live blocks {blocks:>9}  "
+              f"peak {peak / 2**20:8.1f} MiB  {elapsed:6.2f} s")
+
+
+if __name__ == "__main__":
+    main()
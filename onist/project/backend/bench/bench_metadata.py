@@ -0,0 +1,81 @@
+"""
+Metadata extraction on synthetic profile pages (a realistic <head> followed by
+a large body): the previous full BeautifulSoup parse of the whole page versus
+the head-only pull parser, plus how many bytes the streaming fetch reads.
+
+    python -m bench.bench_metadata --pages 200 --body-kb 300
+"""
+import argparse
+import time
+
+from bs4 import BeautifulSoup
+
+from services.parsers import CHUNK_SIZE, HeadParser, parse_metadata
+
+HEAD = """<!doctype html><html lang="en"><head><meta charset="utf-8">
+<title>{name} - profile</title>
+<link rel="stylesheet" href="/static/app.css">
+<script>window.__config = {{"theme": "dark", "build": "{i}"}};</script>
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<meta property="og:title" content="{name}">
+<meta property="og:description" content="Developer profile of {name}">
+<meta property="og:image" content="https://cdn.example.com/avatars/{i}.png">
+<meta name="twitter:card" content="summary">
+</head>"""
+
+
+def legacy_parse_metadata(html):
+    # The previous parse_metadata: full tree for the whole page
+    soup = BeautifulSoup(html, "lxml")
+    meta = {}
+    for tag in soup.find_all("meta"):
+        k = (tag.get("property") or tag.get("name") or "").strip().lower()
+        v = (tag.get("content") or "").strip()
+        if k and v:
+            meta[k] = v
+    return {
+        "title": meta.get("og:title") or meta.get("twitter:title") or "",
+        "description": meta.get("og:description") or meta.get("twitter:description") or "",
+        "image": meta.get("og:image") or meta.get("twitter:image") or "",
+    }
+
+
+def page(i: int, body_kb: int) -> str:
+    row = f'<div class="repo"><a href="/u{i}/r">repo</a><p>description text</p></div>\n'
+    body = row * (body_kb * 1024 // len(row))
+    return HEAD.format(name=f"User {i}", i=i) + f"<body>{body}</body></html>"
+
+
+def streamed_bytes(html: bytes) -> int:
+    head = HeadParser()
+    for k in range(0, len(html), CHUNK_SIZE):
+        if head.feed(html[k:k + CHUNK_SIZE]):
+            return min(len(html), k + CHUNK_SIZE)
+    return len(html)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--pages", type=int, default=200)
+    ap.add_argument("--body-kb", type=int, default=300)
+    args = ap.parse_args()
+
+    pages = [page(i, args.body_kb) for i in range(args.pages)]
+
+    t0 = time.perf_counter()
+    old = [legacy_parse_metadata(p) for p in pages]
+    old_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    new = [parse_metadata(p) for p in pages]
+    new_s = time.perf_counter() - t0
+
+    total = sum(len(p.encode()) for p in pages)
+    read = sum(streamed_bytes(p.encode()) for p in pages)
+    print(f"{len(pages)} pages x {total / len(pages) / 1024:.0f} KiB   same fields {old == new}")
+    print(f"full soup parse   {1000 * old_s / len(pages):7.2f} ms/page")
+    print(f"head-only parse   {1000 * new_s / len(pages):7.2f} ms/page   speedup {old_s / new_s:5.0f}x")
+    print(f"bytes read        {read / 1024:.0f} KiB of {total / 1024:.0f} KiB ({100 * read / total:.1f}%)")
+
+
+if __name__ == "__main__":
+    main()
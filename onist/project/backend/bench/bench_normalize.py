@@ -0,0 +1,67 @@
+"""
+Throughput of bulk normalization on a synthetic import: --rows phones and
+--rows emails drawn (with heavy repetition) from --unique distinct values,
+some of them invalid. Per-row uncached calls are timed on --naive-rows and
+extrapolated; normalize_many runs on the full column.
+
+    python -m bench.bench_normalize --rows 1000000 --unique 50000 --processes 4
+"""
+import argparse
+import random
+import time
+
+from services import normalize
+from services.normalize import normalize_many
+
+
+def make_column(kind: str, rows: int, unique: int, seed: int):
+    rng = random.Random(seed)
+    if kind == "phone":
+        pool = [rng.choice(("+91 ", "0", "", "+91-")) + f"9{rng.randrange(10**8, 10**9)}" for _ in range(unique)]
+        pool[::20] = [f"12345{k}" for k in range(len(pool[::20]))]  # invalid
+    else:
+        pool = [f"User.{k}@Example{k % 97}.com" for k in range(unique)]
+        pool[::20] = [f"user{k}-at-example.com" for k in range(len(pool[::20]))]  # invalid
+    return [rng.choice(pool) for _ in range(rows)]
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--unique", type=int, default=50_000)
+    ap.add_argument("--naive-rows", type=int, default=20_000)
+    ap.add_argument("--processes", type=int, default=None, help="default: all cores")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    uncached = {"phone": lambda v: normalize._phone(v, "IN"), "email": normalize._email}
+    for kind in ("phone", "email"):
+        column = make_column(kind, args.rows, args.unique, args.seed)
+
+        sample = column[:args.naive_rows]
+        t0 = time.perf_counter()
+        for v in sample:
+            uncached[kind](v)
+        per_row = (time.perf_counter() - t0) / len(sample)
+
+        normalize.CACHE.clear()
+        t0 = time.perf_counter()
+        out = normalize_many(column, kind=kind, processes=args.processes)
+        bulk_s = time.perf_counter() - t0
+        valid = sum(v is not None for v in out)
+        # the same import again: every distinct value is now served from CACHE
+        t0 = time.perf_counter()
+        again = normalize_many(column, kind=kind, processes=args.processes)
+        repeat_s = time.perf_counter() - t0
+
+        naive_s = per_row * len(column)
+        print(f"{kind:<5} rows {len(column)}  distinct {len(set(column))}  valid {valid}")
+        print(f"      per-row calls  ~{naive_s:7.1f} s  ({len(column) / naive_s:10.0f} rows/s, extrapolated)")
+        print(f"      normalize_many  {bulk_s:7.1f} s  ({len(column) / bulk_s:10.0f} rows/s)  "
+              f"speedup {naive_s / bulk_s:5.1f}x")
+        print(f"      repeat import   {repeat_s:7.1f} s  ({len(column) / repeat_s:10.0f} rows/s)  "
+              f"same {again == out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Bing social search against a local stand-in for the Bing endpoint: the
+previous single OR-ed query (first page only) versus the per-site, multi-page
+fan-out with canonical-URL dedupe, then the same searches again to show the
+(query, page) cache absorbing repeats. Start the stand-in first, e.g. from
+osint-investigator/backend:
+
+    python -m bench.stub_upstream --port 8081 --latency bing=lognormal:0.3,0.5
+    python -m bench.bench_search --upstream http://127.0.0.1:8081 --users 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+
+
+async def legacy_search(username, client, get_json, bing_url):
+    # The previous search_socials: one OR-ed query, first page, no cache
+    query = f"{username} site:instagram.com OR site:twitter.com OR site:linkedin.com OR site:facebook.com"
+    data, status = await get_json(bing_url, headers={"Ocp-Apim-Subscription-Key": ""},
+                                  params={"q": query}, client=client)
+    return data.get("webPages", {}).get("value", []) if status == 200 and data else []
+
+
+async def run(args):
+    from services.collectors import search_collector as sc
+    from services.utils import create_client, get_json
+
+    users = [f"user{k}" for k in range(args.users)]
+    async with create_client() as client:
+        for label in ("single OR query", "fan-out (cold)", "fan-out (cached)"):
+            latencies, firsts, results, unique = [], [], 0, 0
+            for u in users:
+                t0 = time.perf_counter()
+                if label.startswith("fan-out"):
+                    found = []
+                    async for item in sc.stream_socials(u, client):
+                        if not found:
+                            firsts.append(time.perf_counter() - t0)
+                        found.append(item)
+                else:
+                    found = await legacy_search(u, client, get_json, sc.BING_URL)
+                latencies.append(time.perf_counter() - t0)
+                results += len(found)
+                unique += len({sc.canonical_url(r["url"]) for r in found})
+            first = f"  first result p50 {1000 * percentile(firsts, 0.5):6.1f} ms" if firsts else ""
+            print(f"{label:<17} p50 {1000 * percentile(latencies, 0.5):7.1f} ms  "
+                  f"p95 {1000 * percentile(latencies, 0.95):7.1f} ms{first}  "
+                  f"results/user {results / len(users):6.1f}  unique/user {unique / len(users):6.1f}")
+        print(f"page cache  hits {sc.PAGE_CACHE.hits}  misses {sc.PAGE_CACHE.misses}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--upstream", default="http://127.0.0.1:8081")
+    ap.add_argument("--users", type=int, default=20)
+    args = ap.parse_args()
+    os.environ["OSINT_UPSTREAM_BASE"] = args.upstream  # read when services.utils is imported
+    os.environ.setdefault("BING_API_KEY", "stub")      # the stand-in accepts any key
+    if "services.utils" in sys.modules:
+        sys.exit("services.utils already imported; run this as its own process")
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+EvidenceStore on a file-backed SQLite database: bulk insert with batched
+transactions versus one commit per row, then indexed "have we seen this"
+lookups (phone, email, handle, link domain) against the filled store.
+
+    python -m bench.bench_store --profiles 100000 --db /tmp/onist_evidence.db
+"""
+import argparse
+import os
+import random
+import time
+
+from bench.synthetic import make_profiles
+from services.evidence_store import EvidenceStore
+
+
+def fresh(path: str) -> EvidenceStore:
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+    return EvidenceStore(path)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--profiles", type=int, default=100_000)
+    ap.add_argument("--per-row", type=int, default=2_000, help="rows for the per-row-commit baseline")
+    ap.add_argument("--lookups", type=int, default=2_000)
+    ap.add_argument("--db", default="/tmp/onist_evidence.db")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    profiles = make_profiles(args.profiles, args.seed)
+
+    store = fresh(args.db)
+    sample = profiles[:args.per_row]
+    t0 = time.perf_counter()
+    for p in sample:
+        store.add_evidence([p], batch_size=1)
+    per_row_s = time.perf_counter() - t0
+    store.close()
+
+    store = fresh(args.db)
+    t0 = time.perf_counter()
+    store.add_evidence(profiles)
+    batched_s = time.perf_counter() - t0
+    print(f"insert  per-row commits {len(sample) / per_row_s:9.0f} rows/s   "
+          f"batched {len(profiles) / batched_s:9.0f} rows/s   ({batched_s:.1f} s for {len(profiles)})")
+
+    rng = random.Random(args.seed)
+    picks = rng.sample(profiles, args.lookups)
+    probes = {
+        "phone": [p.phones[0] for p in picks if p.phones],
+        "email": [p.emails[0] for p in picks if p.emails],
+        "handle": [p.handle for p in picks],
+        "domain": [p.links[0] for p in picks if p.links],
+    }
+    lookups = {
+        "phone": store.seen_phone,
+        "email": lambda v: bool(store.by_email(v)),
+        "handle": store.seen_handle,
+        "domain": lambda v: bool(store.by_domain(v)),
+    }
+    for kind, values in probes.items():
+        t0 = time.perf_counter()
+        hits = sum(1 for v in values if lookups[kind](v))
+        elapsed = time.perf_counter() - t0
+        print(f"lookup  {kind:<6} {1e6 * elapsed / max(1, len(values)):8.1f} us   hits {hits}/{len(values)}")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
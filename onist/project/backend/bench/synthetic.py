@@ -0,0 +1,94 @@
+"""
+Synthetic ProfileEvidence for the scoring benchmarks: people with 1-4 accounts
+each, whose handles, display names, bios, links and contact details overlap the
+way real cross-platform accounts do, plus a share of unrelated noise profiles.
+"""
+import random
+from typing import List
+
+from core.models import ProfileEvidence
+
+FIRST = ("aarav arjun priya ananya rahul sneha vikram kavya rohan isha john jane "
+         "maria carlos li wei fatima omar sofia lucas emma liam noah olivia ava mia "
+         "ethan amir yuki hana ivan olga pierre chloe david sarah michael laura "
+         "daniel nina kiran deepak meera sanjay ravi pooja arun divya").split()
+LAST = ("sharma patel kumar singh reddy iyer nair gupta mehta rao smith johnson "
+        "williams brown jones garcia miller davis martinez lopez wilson anderson "
+        "thomas taylor moore jackson martin lee thompson white harris clark lewis "
+        "walker young allen king wright scott torres nguyen hill flores green adams "
+        "baker nelson carter mitchell perez roberts turner phillips campbell parker "
+        "evans edwards collins stewart sanchez morris rogers reed cook morgan bell").split()
+EMPLOYERS = ("Infosys TCS Wipro Google Microsoft Amazon Flipkart Zoho Razorpay Swiggy "
+             "Accenture Deloitte IBM Oracle SAP Adobe Intel Nvidia Meta Netflix").split()
+SCHOOLS = ("IIT Bombay|IIT Delhi|BITS Pilani|NIT Trichy|IIIT Hyderabad|MIT|Stanford|"
+           "VIT Vellore|Anna University|Delhi University").split("|")
+CITIES = ("Bengaluru|Hyderabad|Chennai|Mumbai|Pune|Delhi|Kolkata|London|Berlin|"
+          "San Francisco|New York|Toronto|Singapore").split("|")
+WORDS = ("python rust golang devops ml data backend frontend security osint "
+         "cloud kubernetes react android ios open source maintainer speaker "
+         "researcher student engineer founder writer photographer gamer").split()
+PLATFORMS = ("github", "reddit", "devto", "codeforces", "twitter", "linkedin", "instagram")
+
+
+def _handle(rng: random.Random, first: str, last: str) -> str:
+    style = rng.randrange(6)
+    if style == 0:
+        return first + last
+    if style == 1:
+        return f"{first}_{last}"
+    if style == 2:
+        return f"{first[0]}{last}{rng.randrange(10, 99)}"
+    if style == 3:
+        return f"{last}.{first}"
+    if style == 4:
+        return f"{first}{rng.randrange(1980, 2005)}"
+    return f"the{first}{last[:3]}"
+
+
+def _person(rng: random.Random, pid: int) -> dict:
+    first, last = rng.choice(FIRST), rng.choice(LAST)
+    return {
+        "first": first,
+        "last": last,
+        "email": f"{first}.{last}{pid}@example.com",
+        "phone": f"+9198{pid:08d}",
+        "site": f"https://{first}{last}{pid}.dev",
+        "employer": rng.choice(EMPLOYERS),
+        "school": rng.choice(SCHOOLS),
+        "city": rng.choice(CITIES),
+        "topics": rng.sample(WORDS, 4),
+    }
+
+
+def _profile(rng: random.Random, person: dict, platform: str) -> ProfileEvidence:
+    first, last = person["first"], person["last"]
+    display = rng.choice((f"{first.title()} {last.title()}", f"{first.title()} {last[0].upper()}.",
+                          f"{first.title()}", None))
+    bio_words = person["topics"][:rng.randint(2, 4)] + rng.sample(WORDS, 2)
+    return ProfileEvidence(
+        platform=platform,
+        url=f"https://{platform}.com/{first}{last}",
+        handle=_handle(rng, first, last),
+        display_name=display,
+        bio=" ".join(bio_words),
+        location=person["city"] if rng.random() < 0.6 else None,
+        employer=person["employer"] if rng.random() < 0.5 else None,
+        education=person["school"] if rng.random() < 0.3 else None,
+        links=[person["site"]] if rng.random() < 0.4 else [],
+        emails=[person["email"]] if rng.random() < 0.2 else [],
+        phones=[person["phone"]] if rng.random() < 0.1 else [],
+        confidence_local=round(rng.uniform(0.3, 0.9), 2),
+    )
+
+
+def make_profiles(n: int, seed: int = 7) -> List[ProfileEvidence]:
+    rng = random.Random(seed)
+    out: List[ProfileEvidence] = []
+    pid = 0
+    while len(out) < n:
+        person = _person(rng, pid)
+        pid += 1
+        for platform in rng.sample(PLATFORMS, rng.randint(1, 4)):
+            out.append(_profile(rng, person, platform))
+    rng.shuffle(out)
+    return out[:n]
@@ -0,0 +1,136 @@
+from __future__ import annotations
+import math
+from collections import Counter, defaultdict
+from itertools import combinations
+from typing import Callable, Dict, Iterable, List, Set, Tuple
+from .hashindex import HashIndex
+from .scoring import AVATAR_RADIUS, EDGE_THRESHOLD, WEIGHTS, ProfileFeatures
+
+# Blocking: only pairs that can reach EDGE_THRESHOLD get scored by build_matches.
+#
+# Links, avatar, email and phone score nothing unless the two profiles share a
+# value (or avatar hashes within AVATAR_RADIUS), so those are exact keys. Name
+# is taken at its maximum of 1.0, and employer / education likewise when both
+# profiles have one (an empty side scores 0). What is left of the threshold,
+# slack(a, b), must come from bio and location:
+#     bio * WEIGHTS["bio"] + location * WEIGHTS["location"] >= slack
+# Splitting the slack evenly, a pair with no shared exact key needs bio Jaccard
+# >= slack / (2 * WEIGHTS["bio"]) or location Jaccard >= slack / (2 * WEIGHTS["location"]).
+# Both are found exactly by prefix filtering: two token sets with Jaccard >= t
+# share a token among the first |A| - ceil(t * |A|) + 1 tokens of each, for any
+# fixed token order (rare tokens first keeps postings short). Thresholds depend
+# on which of employer / education each side has, so prefix keys are emitted
+# per pair of such classes. Every pair scoring >= EDGE_THRESHOLD is a
+# candidate; recall is 1.
+
+EPS = 1e-9  # keeps float rounding on the candidate side of every bound
+
+Pair = Tuple[int, int]
+TokenOrder = Callable[[str], tuple]
+
+def exact_keys(f: ProfileFeatures) -> Set[str]:
+    # mirror what score_features compares, so a shared key is a shared signal
+    keys = {"e:" + e for e in f.emails}
+    keys |= {"p:" + x for x in f.phones}
+    keys |= {"l:" + l for l in f.links}
+    if f.avatar_url:
+        keys.add("a:" + f.avatar_url)
+    return keys
+
+Presence = Tuple[bool, bool]  # has employer, has education
+CLASSES: List[Presence] = [(e, d) for e in (False, True) for d in (False, True)]
+
+def presence(f: ProfileFeatures) -> Presence:
+    return bool(f.employer), bool(f.education)
+
+def slack(a: Presence, b: Presence) -> float:
+    best = WEIGHTS["name"]
+    best += WEIGHTS["employer"] if a[0] and b[0] else 0.0
+    best += WEIGHTS["education"] if a[1] and b[1] else 0.0
+    return EDGE_THRESHOLD / 100.0 - best - EPS
+
+def prefix(tokens: frozenset, t: float, order: TokenOrder) -> List[str]:
+    # tokens a set needs to share with any set it has Jaccard >= t with
+    n = len(tokens)
+    return sorted(tokens, key=order)[:max(0, n - math.ceil(t * n - EPS) + 1)] if n else []
+
+def prefix_keys(f: ProfileFeatures, order: TokenOrder) -> Set[str]:
+    keys: Set[str] = set()
+    mine = presence(f)
+    for other in CLASSES:
+        tag = "%d%d%d%d" % min(mine + other, other + mine)
+        room = slack(mine, other)
+        if room <= 0:
+            keys.add("*:" + tag)  # bio and location aren't needed: every such pair is a candidate
+            continue
+        keys |= {f"b{tag}:{t}" for t in prefix(f.bio_tokens, room / (2 * WEIGHTS["bio"]), order)}
+        keys |= {f"c{tag}:{t}" for t in prefix(f.location_tokens, room / (2 * WEIGHTS["location"]), order)}
+    return keys
+
+def fixed_order(token: str) -> tuple:
+    # data-independent order for the incremental index; long tokens tend to be rare
+    return (-len(token), token)
+
+def frequency_order(profiles: List[ProfileFeatures]) -> TokenOrder:
+    df = Counter(t for f in profiles for t in f.bio_tokens | f.location_tokens)
+    return lambda token: (df[token], token)
+
+def _index(profiles: List[ProfileFeatures], keys_of) -> Dict[str, List[int]]:
+    index: Dict[str, List[int]] = defaultdict(list)
+    for i, p in enumerate(profiles):
+        for key in keys_of(p):
+            index[key].append(i)
+    return index
+
+def _pairs(ids: List[int]) -> Iterable[Pair]:
+    return combinations(ids, 2)  # ids are ascending, so i < j
+
+def candidate_pairs(profiles: List[ProfileFeatures]) -> List[Pair]:
+    """
+    Pairs (i < j) that can score >= EDGE_THRESHOLD: those sharing an exact key
+    or an avatar hash, or passing the bio / location prefix filter.
+    """
+    order = frequency_order(profiles)
+    out: Set[Pair] = set()
+    for ids in _index(profiles, exact_keys).values():
+        out.update(_pairs(ids))
+    for ids in _index(profiles, lambda f: prefix_keys(f, order)).values():
+        out.update(_pairs(ids))
+    out.update(avatar_pairs(profiles))
+    return sorted(out)
+
+def avatar_pairs(profiles: List[ProfileFeatures]) -> Set[Pair]:
+    # Pairs (i < j) whose avatar hashes are within AVATAR_RADIUS
+    index = HashIndex(AVATAR_RADIUS)
+    out: Set[Pair] = set()
+    for j, f in enumerate(profiles):
+        if f.avatar_hash is None:
+            continue
+        out.update((i, j) for i, _ in index.query(f.avatar_hash))
+        index.add(f.avatar_hash, j)
+    return out
+
+class CandidateIndex:
+    """
+    Incremental form of candidate_pairs for cases that grow one profile at a
+    time. Prefixes use fixed_order, so the candidates can differ from the batch
+    form, but every pair that can reach EDGE_THRESHOLD is still among them.
+    """
+    def __init__(self):
+        self.keys: Dict[str, List[int]] = defaultdict(list)
+        self.avatars = HashIndex(AVATAR_RADIUS)
+        self.size = 0
+
+    def add(self, f: ProfileFeatures) -> List[int]:
+        """
+        Index the next profile; returns the earlier profiles it should be scored against.
+        """
+        out: Set[int] = set()
+        for key in exact_keys(f) | prefix_keys(f, fixed_order):
+            out.update(self.keys[key])
+            self.keys[key].append(self.size)
+        if f.avatar_hash is not None:
+            out.update(i for i, _ in self.avatars.query(f.avatar_hash))
+            self.avatars.add(f.avatar_hash, self.size)
+        self.size += 1
+        return sorted(out)
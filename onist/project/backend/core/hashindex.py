@@ -0,0 +1,63 @@
+from __future__ import annotations
+from typing import Dict, Hashable, List, Tuple
+
+# Multi-index hashing over 64-bit perceptual hashes: each hash is split into
+# radius + 1 disjoint bit chunks, each chunk gets its own exact-match table.
+# Two hashes within `radius` bits must agree exactly on at least one chunk
+# (pigeonhole), so a query only verifies the entries sharing a chunk with it
+# instead of scanning everything.
+
+BITS = 64
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+# SQLite INTEGER is signed 64-bit: store hashes signed, read them back unsigned
+
+def to_signed(h: int) -> int:
+    return h - (1 << BITS) if h >= 1 << (BITS - 1) else h
+
+def to_unsigned(h: int) -> int:
+    return h & ((1 << BITS) - 1)
+
+class HashIndex:
+    def __init__(self, radius: int):
+        self.radius = radius
+        m = radius + 1
+        widths = [BITS // m + (1 if k < BITS % m else 0) for k in range(m)]
+        self._chunks: List[Tuple[int, int]] = []  # (shift, mask)
+        shift = 0
+        for w in widths:
+            self._chunks.append((shift, (1 << w) - 1))
+            shift += w
+        self._tables: List[Dict[int, List[int]]] = [{} for _ in widths]
+        self.hashes: List[int] = []
+        self.keys: List[Hashable] = []
+
+    def __len__(self) -> int:
+        return len(self.hashes)
+
+    def add(self, h: int, key: Hashable):
+        n = len(self.hashes)
+        self.hashes.append(h)
+        self.keys.append(key)
+        for (shift, mask), table in zip(self._chunks, self._tables):
+            table.setdefault((h >> shift) & mask, []).append(n)
+
+    def query(self, h: int, radius: int | None = None) -> List[Tuple[Hashable, int]]:
+        """
+        (key, distance) for every stored hash within `radius` (at most the
+        index radius) of h.
+        """
+        radius = self.radius if radius is None else min(radius, self.radius)
+        seen = set()
+        out: List[Tuple[Hashable, int]] = []
+        for (shift, mask), table in zip(self._chunks, self._tables):
+            for n in table.get((h >> shift) & mask, ()):
+                if n in seen:
+                    continue
+                seen.add(n)
+                d = hamming(h, self.hashes[n])
+                if d <= radius:
+                    out.append((self.keys[n], d))
+        return out
@@ -0,0 +1,123 @@
+from __future__ import annotations
+from typing import Dict, List, Optional, Tuple
+from .blocking import CandidateIndex
+from .models import CaseResult, Cluster, Inputs, ProfileEvidence
+from .scoring import (EDGE_THRESHOLD, AvatarHashes, DisjointSet, Match, ProfileFeatures, Scores,
+                      profile_features, score_features)
+
+# Live case: a case that grows as collector results stream in. New evidence is
+# scored only against the profiles already in the case, clusters are merged in
+# place, and cluster confidence (the average score of the edges inside the
+# cluster, as in build_clusters) is kept as a running sum. Matches are kept
+# as engine-side Match tuples; to_case() builds the CaseResult model.
+
+class LiveCase:
+    def __init__(self, inputs: Optional[Inputs] = None, avatar_hashes: Optional[AvatarHashes] = None):
+        self.inputs = inputs or Inputs()
+        self.avatar_hashes = avatar_hashes  # read when each profile is added
+        self.profiles: List[ProfileEvidence] = []
+        self.matches: List[Match] = []
+        self.feats: List[ProfileFeatures] = []
+        self.index = CandidateIndex()
+        self.ds = DisjointSet(0)
+        self.adj: List[List[Tuple[int, float]]] = []  # edges (>= EDGE_THRESHOLD) per profile
+        self.by_root: Dict[int, Cluster] = {}
+        self.sums: Dict[int, float] = {}
+        self.counts: Dict[int, int] = {}
+
+    @classmethod
+    def from_case(cls, case: CaseResult, avatar_hashes: Optional[AvatarHashes] = None) -> "LiveCase":
+        """
+        Take over an existing case (e.g. from build_matches/build_clusters)
+        without rescoring it.
+        """
+        live = cls(case.inputs, avatar_hashes)
+        for p in case.profiles:
+            live._append(p)
+        for m in case.matches:
+            match = Match(m.i, m.j, Scores(**m.scores.model_dump()))
+            live.matches.append(match)
+            live._link(match.i, match.j, match.scores.total)
+        return live
+
+    @property
+    def clusters(self) -> List[Cluster]:
+        return sorted(self.by_root.values(), key=lambda c: c.profile_indices[0])
+
+    def add(self, evidence: List[ProfileEvidence]) -> List[Cluster]:
+        """
+        Append new evidence, score it against the case and update clusters.
+        """
+        for p in evidence:
+            k = len(self.profiles)
+            earlier = self._append(p)
+            f = self.feats[k]
+            for i in earlier:
+                match = Match(i, k, score_features(self.feats[i], f))
+                self.matches.append(match)
+                self._link(i, k, match.scores.total)
+        return self.clusters
+
+    def to_case(self) -> CaseResult:
+        return CaseResult(inputs=self.inputs, profiles=list(self.profiles),
+                          matches=[m.to_model() for m in self.matches],
+                          clusters=[c.model_copy() for c in self.clusters])
+
+    # -- internals --
+
+    def _append(self, p: ProfileEvidence) -> List[int]:
+        k = len(self.profiles)
+        f = profile_features(p, self.avatar_hashes)
+        self.profiles.append(p)
+        self.feats.append(f)
+        self.ds.parent.append(k)
+        self.ds.size.append(1)
+        self.adj.append([])
+        self.by_root[k] = Cluster(profile_indices=[k], cluster_confidence=p.confidence_local * 100.0)
+        self.sums[k] = 0.0
+        self.counts[k] = 0
+        return self.index.add(f)
+
+    def _link(self, i: int, j: int, total: float):
+        if total < EDGE_THRESHOLD:
+            return  # neither links clusters nor counts towards their confidence
+        self.adj[i].append((j, total))
+        self.adj[j].append((i, total))
+        ri, rj = self.ds.find(i), self.ds.find(j)
+        if ri == rj:
+            self._account(ri, total)
+        else:
+            self._merge(ri, rj)
+
+    def _account(self, root: int, total: float):
+        self.sums[root] += total
+        self.counts[root] += 1
+        cluster = self.by_root[root]
+        cluster.cluster_confidence = self.sums[root] / self.counts[root]
+
+    def _merge(self, ra: int, rb: int):
+        a, b = self.by_root.pop(ra), self.by_root.pop(rb)
+        small = a if len(a.profile_indices) <= len(b.profile_indices) else b
+        other = rb if small is a else ra
+        # edges between the two clusters now fall inside the merged one
+        cross = [t for u in small.profile_indices for v, t in self.adj[u] if self.ds.find(v) == other]
+        sums = self.sums.pop(ra) + self.sums.pop(rb) + sum(cross)
+        counts = self.counts.pop(ra) + self.counts.pop(rb) + len(cross)
+
+        root = self.ds.union(ra, rb)
+        keep = a if root == ra else b
+        keep.profile_indices = sorted(a.profile_indices + b.profile_indices)
+        keep.cluster_confidence = sums / counts
+        self.by_root[root] = keep
+        self.sums[root] = sums
+        self.counts[root] = counts
+
+def add_evidence(case: CaseResult, evidence: List[ProfileEvidence],
+                 avatar_hashes: Optional[AvatarHashes] = None) -> CaseResult:
+    """
+    One-off incremental update of an existing case; keep a LiveCase around
+    instead when updates keep coming.
+    """
+    live = LiveCase.from_case(case, avatar_hashes)
+    live.add(evidence)
+    return live.to_case()
@@ -0,0 +1,167 @@
+from __future__ import annotations
+from collections import defaultdict
+from typing import Dict, List, Sequence
+import numpy as np
+from rapidfuzz import fuzz, process
+from .models import ProfileEvidence, ProfileMatch
+from .blocking import avatar_pairs
+from .scoring import (EDGE_THRESHOLD, WEIGHTS, AvatarHashes, Match, ProfileFeatures,
+                      profile_features, score_features)
+
+# Matrix scoring: every field for a block of rows against all later profiles at
+# once. String fields go through rapidfuzz.process.cdist (multi-threaded via
+# `workers`); set fields (bio/location tokens, links, avatar URL, email, phone)
+# are joined through inverted indexes and near-identical avatars come from the
+# hash-index pairs in blocking. Only edges at or above the threshold are
+# materialized, as Match tuples (ProfileMatch models from matrix_matches).
+
+BLOCK_ROWS = 512  # rows scored per block; memory is ~BLOCK_ROWS * n floats per field
+SLACK = 0.01      # float32 rounding margin before the exact re-score of an edge
+
+class _SetField:
+    """
+    One set-valued field, indexed for sparse overlap joins.
+    """
+    def __init__(self, sets: Sequence[frozenset]):
+        self.sizes = np.fromiter((len(s) for s in sets), dtype=np.float32, count=len(sets))
+        postings: Dict[str, List[int]] = defaultdict(list)
+        for i, s in enumerate(sets):
+            for key in s:
+                postings[key].append(i)
+        self.postings = [np.asarray(ids) for ids in postings.values() if len(ids) > 1]
+
+    def shared(self, r0: int, r1: int, c0: int) -> np.ndarray:
+        # |A & B| for rows r0:r1 against columns c0:
+        n = len(self.sizes)
+        inter = np.zeros((r1 - r0, n - c0), dtype=np.float32)
+        for ids in self.postings:
+            rows = ids[(ids >= r0) & (ids < r1)] - r0
+            if rows.size:
+                cols = ids[ids >= c0] - c0
+                inter[np.ix_(rows, cols)] += 1
+        return inter
+
+    def jaccard(self, r0: int, r1: int, c0: int) -> np.ndarray:
+        inter = self.shared(r0, r1, c0)
+        a = self.sizes[r0:r1, None]
+        b = self.sizes[None, c0:]
+        union = a + b - inter
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out = np.where((a > 0) & (b > 0), inter / union, 0.0)
+        return out.astype(np.float32)
+
+    def any_shared(self, r0: int, r1: int, c0: int) -> np.ndarray:
+        return (self.shared(r0, r1, c0) > 0).astype(np.float32)
+
+class _StringField:
+    """
+    One string field; WRatio runs on distinct values only (employers, schools
+    and empty fields repeat a lot) and is expanded back to rows x columns.
+    """
+    def __init__(self, values: List[str]):
+        uniq, inverse = np.unique(np.asarray(values, dtype=object), return_inverse=True)
+        self.values = list(uniq)
+        self.inverse = inverse
+
+    def ratio(self, r0: int, r1: int, c0: int, workers: int) -> np.ndarray:
+        rows, cols = self.inverse[r0:r1], self.inverse[c0:]
+        ur, uc = np.unique(rows), np.unique(cols)
+        m = process.cdist([self.values[k] for k in ur], [self.values[k] for k in uc],
+                          scorer=fuzz.WRatio, dtype=np.float32, workers=workers)
+        return m[np.ix_(np.searchsorted(ur, rows), np.searchsorted(uc, cols))] / 100.0
+
+class _PairField:
+    """
+    A symmetric 0/1 relation given as explicit pairs (near-duplicate avatars).
+    """
+    def __init__(self, pairs, n: int):
+        self.n = n
+        both = [(i, j) for i, j in pairs] + [(j, i) for i, j in pairs]
+        self.rows = np.fromiter((i for i, _ in both), dtype=np.int64, count=len(both))
+        self.cols = np.fromiter((j for _, j in both), dtype=np.int64, count=len(both))
+
+    def block(self, r0: int, r1: int, c0: int) -> np.ndarray:
+        out = np.zeros((r1 - r0, self.n - c0), dtype=np.float32)
+        keep = (self.rows >= r0) & (self.rows < r1) & (self.cols >= c0)
+        out[self.rows[keep] - r0, self.cols[keep] - c0] = 1.0
+        return out
+
+class MatrixScorer:
+    """
+    Vectorized score_features over a fixed list of profiles.
+    """
+    def __init__(self, feats: List[ProfileFeatures], workers: int = -1):
+        self.feats = feats
+        self.workers = workers
+        self.n = len(feats)
+        self.names = _StringField([f.name for f in feats])
+        self.handles = _StringField([f.handle for f in feats])
+        self.employers = _StringField([f.employer for f in feats])
+        self.educations = _StringField([f.education for f in feats])
+        self.bio = _SetField([f.bio_tokens for f in feats])
+        self.location = _SetField([f.location_tokens for f in feats])
+        self.links = _SetField([f.links for f in feats])
+        self.avatar = _SetField([frozenset([f.avatar_url]) if f.avatar_url else frozenset() for f in feats])
+        self.avatar_near = _PairField(avatar_pairs(feats), self.n)
+        self.emails = _SetField([f.emails for f in feats])
+        self.phones = _SetField([f.phones for f in feats])
+
+    def _ratio(self, field: _StringField, r0: int, r1: int, c0: int) -> np.ndarray:
+        return field.ratio(r0, r1, c0, self.workers)
+
+    def block(self, r0: int, r1: int, c0: int = 0) -> np.ndarray:
+        """
+        Total scores for rows r0:r1 against columns c0: (same scale as PairScores.total).
+        """
+        name = np.maximum(self._ratio(self.names, r0, r1, c0),
+                          self._ratio(self.handles, r0, r1, c0))
+        base = (
+            name * WEIGHTS["name"] +
+            self.bio.jaccard(r0, r1, c0) * WEIGHTS["bio"] +
+            self._ratio(self.employers, r0, r1, c0) * WEIGHTS["employer"] +
+            self._ratio(self.educations, r0, r1, c0) * WEIGHTS["education"] +
+            self.links.jaccard(r0, r1, c0) * WEIGHTS["links"] +
+            self.location.jaccard(r0, r1, c0) * WEIGHTS["location"] +
+            np.maximum(self.avatar.any_shared(r0, r1, c0),
+                       self.avatar_near.block(r0, r1, c0)) * WEIGHTS["avatar"]
+        )
+        bonus = (self.emails.any_shared(r0, r1, c0) * WEIGHTS["email"] +
+                 self.phones.any_shared(r0, r1, c0) * WEIGHTS["phone"])
+        return np.minimum(100.0, (base + bonus) * 100.0)
+
+    def matrix(self) -> np.ndarray:
+        """
+        Full n x n score matrix (diagonal included); fine for a single case.
+        """
+        if not self.n:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack([self.block(r0, min(r0 + BLOCK_ROWS, self.n))
+                          for r0 in range(0, self.n, BLOCK_ROWS)])
+
+    def edges(self, threshold: float = EDGE_THRESHOLD) -> List[Match]:
+        """
+        Pairs (i < j) scoring at or above threshold, upper triangle only.
+        """
+        out: List[Match] = []
+        for r0 in range(0, self.n, BLOCK_ROWS):
+            r1 = min(r0 + BLOCK_ROWS, self.n)
+            totals = self.block(r0, r1, r0)
+            rows, cols = np.nonzero(totals >= threshold - SLACK)
+            for r, c in zip(rows.tolist(), cols.tolist()):
+                i, j = r0 + r, r0 + c
+                if j <= i:
+                    continue
+                sc = score_features(self.feats[i], self.feats[j])
+                if sc.total >= threshold:
+                    out.append(Match(i, j, sc))
+        return out
+
+def score_matrix(profiles: List[ProfileEvidence], workers: int = -1,
+                 avatar_hashes: AvatarHashes | None = None) -> np.ndarray:
+    return MatrixScorer([profile_features(p, avatar_hashes) for p in profiles], workers).matrix()
+
+def matrix_matches(profiles: List[ProfileEvidence], workers: int = -1,
+                   threshold: float = EDGE_THRESHOLD,
+                   avatar_hashes: AvatarHashes | None = None) -> List[ProfileMatch]:
+    scorer = MatrixScorer([profile_features(p, avatar_hashes) for p in profiles], workers)
+    return [m.to_model() for m in scorer.edges(threshold)]
@@ -1,28 +1,67 @@
 from __future__ import annotations
-from typing import List
+from itertools import combinations
+from typing import Dict, Iterable, List, NamedTuple, Tuple
 from rapidfuzz import fuzz
+from .hashindex import hamming
 from .models import ProfileEvidence, PairScores, ProfileMatch, Cluster
 
 # Helper normalizers
 import re
+from dataclasses import dataclass
+
+_NON_WORD = re.compile(r"[^\w\s]|_")  # keep letters/digits (stdlib re has no \p{L})
+_SPACES = re.compile(r"\s+")
 
 def norm(s: str | None) -> str:
     if not s:
         return ""
-    s = s.lower()
-    s = re.sub(r"[^\p{L}0-9\s]", " ", s)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
+    s = _NON_WORD.sub(" ", s.lower())
+    return _SPACES.sub(" ", s).strip()
 
 # Simple token overlap
 
-def jaccard(a: str, b: str) -> float:
-    A = set(norm(a).split())
-    B = set(norm(b).split())
+def overlap(A: frozenset, B: frozenset) -> float:
     if not A or not B:
         return 0.0
     return len(A & B) / len(A | B)
 
+def jaccard(a: str, b: str) -> float:
+    return overlap(frozenset(norm(a).split()), frozenset(norm(b).split()))
+
+# Per-profile features: everything score_pair needs, normalized once per
+# profile instead of once per pair.
+
+@dataclass(frozen=True)
+class ProfileFeatures:
+    name: str
+    handle: str
+    employer: str
+    education: str
+    bio_tokens: frozenset
+    location_tokens: frozenset
+    links: frozenset
+    emails: frozenset
+    phones: frozenset
+    avatar_url: str | None
+    avatar_hash: int | None = None  # 64-bit perceptual hash, if the avatar was fetched
+
+AvatarHashes = Dict[str, int]  # avatar_url -> perceptual hash (services.avatars)
+
+def profile_features(p: ProfileEvidence, avatar_hashes: AvatarHashes | None = None) -> ProfileFeatures:
+    return ProfileFeatures(
+        name=norm(p.display_name),
+        handle=norm(p.handle),
+        employer=norm(p.employer),
+        education=norm(p.education),
+        bio_tokens=frozenset(norm(p.bio).split()),
+        location_tokens=frozenset(norm(p.location).split()),
+        links=frozenset(norm(x) for x in (p.links or [])),
+        emails=frozenset(p.emails or []),
+        phones=frozenset(p.phones or []),
+        avatar_url=p.avatar_url or None,
+        avatar_hash=(avatar_hashes or {}).get(p.avatar_url) if p.avatar_url else None,
+    )
+
 # Weight scheme
 WEIGHTS = {
     "name": 0.30,
@@ -37,98 +76,167 @@ WEIGHTS = {
 }
 
 EDGE_THRESHOLD = 65.0
+AVATAR_RADIUS = 6  # max Hamming distance between phashes of the "same" picture
+
+def same_avatar(a: ProfileFeatures, b: ProfileFeatures) -> bool:
+    if a.avatar_url and a.avatar_url == b.avatar_url:
+        return True
+    return (a.avatar_hash is not None and b.avatar_hash is not None
+            and hamming(a.avatar_hash, b.avatar_hash) <= AVATAR_RADIUS)
+
+# Engine-side results: plain tuples instead of pydantic models, so scoring
+# n^2 pairs allocates no validated objects. Convert with .to_model() at the
+# API boundary (build_matches, score_pair, LiveCase.to_case).
+
+class Scores(NamedTuple):
+    name: float = 0.0
+    bio: float = 0.0
+    employer: float = 0.0
+    education: float = 0.0
+    links: float = 0.0
+    location: float = 0.0
+    avatar: float = 0.0
+    email: float = 0.0
+    phone: float = 0.0
+    total: float = 0.0
+
+    def to_model(self) -> PairScores:
+        return PairScores(**self._asdict())
+
+class Match(NamedTuple):
+    i: int
+    j: int
+    scores: Scores
+
+    def to_model(self) -> ProfileMatch:
+        return ProfileMatch(i=self.i, j=self.j, scores=self.scores.to_model())
 
 # Compute pairwise score between two profiles
 
-def score_pair(a: ProfileEvidence, b: ProfileEvidence) -> PairScores:
-    s = PairScores()
-
-    s.name = max(
-        fuzz.WRatio(norm(a.display_name), norm(b.display_name)) / 100.0,
-        fuzz.WRatio(norm(a.handle), norm(b.handle)) / 100.0,
-    )
-    s.bio = jaccard(a.bio or "", b.bio or "")
-    s.employer = fuzz.WRatio(norm(a.employer), norm(b.employer)) / 100.0
-    s.education = fuzz.WRatio(norm(a.education), norm(b.education)) / 100.0
+def score_features(a: ProfileFeatures, b: ProfileFeatures) -> Scores:
+    name = max(fuzz.WRatio(a.name, b.name), fuzz.WRatio(a.handle, b.handle)) / 100.0
+    bio = overlap(a.bio_tokens, b.bio_tokens)
+    employer = fuzz.WRatio(a.employer, b.employer) / 100.0
+    education = fuzz.WRatio(a.education, b.education) / 100.0
 
     # links overlap
-    links_a = set([norm(x) for x in (a.links or [])])
-    links_b = set([norm(x) for x in (b.links or [])])
-    s.links = (len(links_a & links_b) / len(links_a | links_b)) if (links_a or links_b) else 0.0
+    union = len(a.links | b.links)
+    links = len(a.links & b.links) / union if union else 0.0
 
     # location token overlap (simple)
-    s.location = jaccard(a.location or "", b.location or "")
+    location = overlap(a.location_tokens, b.location_tokens)
 
-    # avatar similarity (placeholder: if exact URL match)
-    s.avatar = 1.0 if a.avatar_url and b.avatar_url and a.avatar_url == b.avatar_url else 0.0
+    # avatar similarity: same URL, or near-identical picture by perceptual hash
+    avatar = 1.0 if same_avatar(a, b) else 0.0
 
     # email/phone exact matches → strong signals
-    s.email = 1.0 if set(a.emails) & set(b.emails) else 0.0
-    s.phone = 1.0 if set(a.phones) & set(b.phones) else 0.0
+    email = 1.0 if not a.emails.isdisjoint(b.emails) else 0.0
+    phone = 1.0 if not a.phones.isdisjoint(b.phones) else 0.0
 
     base = (
-        s.name * WEIGHTS["name"] +
-        s.bio * WEIGHTS["bio"] +
-        s.employer * WEIGHTS["employer"] +
-        s.education * WEIGHTS["education"] +
-        s.links * WEIGHTS["links"] +
-        s.location * WEIGHTS["location"] +
-        s.avatar * WEIGHTS["avatar"]
+        name * WEIGHTS["name"] +
+        bio * WEIGHTS["bio"] +
+        employer * WEIGHTS["employer"] +
+        education * WEIGHTS["education"] +
+        links * WEIGHTS["links"] +
+        location * WEIGHTS["location"] +
+        avatar * WEIGHTS["avatar"]
     )
     bonus = 0.0
-    if s.email > 0: bonus += WEIGHTS["email"]
-    if s.phone > 0: bonus += WEIGHTS["phone"]
-
-    s.total = min(100.0, (base + bonus) * 100.0)
-    return s
-
-# Build all pair matches
-
-def build_matches(profiles: List[ProfileEvidence]) -> List[ProfileMatch]:
-    out: List[ProfileMatch] = []
-    for i in range(len(profiles)):
-        for j in range(i+1, len(profiles)):
-            sc = score_pair(profiles[i], profiles[j])
-            out.append(ProfileMatch(i=i, j=j, scores=sc))
-    return out
+    if email > 0: bonus += WEIGHTS["email"]
+    if phone > 0: bonus += WEIGHTS["phone"]
+
+    return Scores(name, bio, employer, education, links, location, avatar, email, phone,
+                  min(100.0, (base + bonus) * 100.0))
+
+def score_pair(a: ProfileEvidence, b: ProfileEvidence,
+               avatar_hashes: AvatarHashes | None = None) -> PairScores:
+    return score_features(profile_features(a, avatar_hashes),
+                          profile_features(b, avatar_hashes)).to_model()
+
+# Score pairs (blocked candidates only, or every pair if exhaustive)
+
+def score_candidates(profiles: List[ProfileEvidence], exhaustive: bool = False,
+                     avatar_hashes: AvatarHashes | None = None) -> List[Match]:
+    from .blocking import candidate_pairs  # blocking builds on ProfileFeatures
+
+    feats = [profile_features(p, avatar_hashes) for p in profiles]
+    pairs: Iterable[Tuple[int, int]]
+    if exhaustive:
+        pairs = combinations(range(len(feats)), 2)
+    else:
+        pairs = candidate_pairs(feats)
+    return [Match(i, j, score_features(feats[i], feats[j])) for i, j in pairs]
+
+def build_matches(profiles: List[ProfileEvidence], exhaustive: bool = False,
+                  avatar_hashes: AvatarHashes | None = None) -> List[ProfileMatch]:
+    return [m.to_model() for m in score_candidates(profiles, exhaustive, avatar_hashes)]
+
+# Clustering: connected components of the thresholded match graph
+
+class DisjointSet:
+    """
+    Union-find with path halving and union by size.
+    """
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+        self.size = [1] * n
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int) -> int:
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return ra
+        if self.size[ra] < self.size[rb]:
+            ra, rb = rb, ra
+        self.parent[rb] = ra
+        self.size[ra] += self.size[rb]
+        return ra
+
+def edge_index(matches: Iterable[ProfileMatch | Match]) -> Dict[Tuple[int, int], float]:
+    # (i, j) with i < j -> total score; one entry per scored pair
+    return {(min(m.i, m.j), max(m.i, m.j)): m.scores.total for m in matches}
+
+def build_clusters(profiles: List[ProfileEvidence], matches: Iterable[ProfileMatch | Match]) -> List[Cluster]:
+    """
+    Connected components of the pairs scoring >= EDGE_THRESHOLD. Confidence
+    is the mean score of those edges inside the cluster, so it is the same for
+    blocked and exhaustive matches (blocking keeps every such pair); a
+    singleton keeps its profile's confidence_local, scaled to 0-100.
+    """
+    n = len(profiles)
+    edges = edge_index(matches)
+    ds = DisjointSet(n)
+    for (i, j), total in edges.items():
+        if total >= EDGE_THRESHOLD:
+            ds.union(i, j)
 
-# Simple clustering via thresholded graph components
+    members: Dict[int, List[int]] = {}
+    for i in range(n):
+        members.setdefault(ds.find(i), []).append(i)
+
+    # cluster confidence: avg score of the edges inside the cluster
+    sums: Dict[int, float] = {}
+    counts: Dict[int, int] = {}
+    for (i, j), total in edges.items():
+        if total < EDGE_THRESHOLD:
+            continue
+        root = ds.find(i)
+        if root == ds.find(j):
+            sums[root] = sums.get(root, 0.0) + total
+            counts[root] = counts.get(root, 0) + 1
 
-def build_clusters(profiles: List[ProfileEvidence], matches: List[ProfileMatch]) -> List[Cluster]:
-    # Build adjacency
-    n = len(profiles)
-    adj = {i: set() for i in range(n)}
-    for m in matches:
-        if m.scores.total >= EDGE_THRESHOLD:
-            adj[m.i].add(m.j)
-            adj[m.j].add(m.i)
-
-    # DFS components
-    seen = set()
     clusters: List[Cluster] = []
-    for i in range(n):
-        if i in seen: continue
-        stack = [i]
-        comp = []
-        while stack:
-            u = stack.pop()
-            if u in seen: continue
-            seen.add(u)
-            comp.append(u)
-            for v in adj[u]:
-                if v not in seen:
-                    stack.append(v)
-        # cluster confidence: avg of edges among members (rough)
+    for root, comp in members.items():  # ordered by lowest member index
         if len(comp) == 1:
             conf = profiles[comp[0]].confidence_local * 100.0
         else:
-            edges = []
-            for a in range(len(comp)):
-                for b in range(a+1, len(comp)):
-                    # find match
-                    i, j = comp[a], comp[b]
-                    sc = next((m.scores.total for m in matches if (m.i==i and m.j==j) or (m.i==j and m.j==i)), 0.0)
-                    edges.append(sc)
-            conf = sum(edges)/len(edges) if edges else 0.0
+            conf = sums[root] / counts[root]
         clusters.append(Cluster(profile_indices=comp, cluster_confidence=conf))
-    return clusters
\ No newline at end of file
+    return clusters
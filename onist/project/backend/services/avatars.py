@@ -0,0 +1,155 @@
+import asyncio
+import hashlib
+import io
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import httpx
+import imagehash
+from PIL import Image
+
+from core.hashindex import HashIndex, to_signed, to_unsigned
+from core.scoring import AVATAR_RADIUS
+
+AVATAR_DB = os.getenv("AVATAR_CACHE_DB", "")  # SQLite path; "" keeps the store in memory
+AVATAR_CONCURRENCY = 8                         # avatar downloads in flight
+MAX_AVATAR_BYTES = 2 * 1024 * 1024
+
+def phash64(data: bytes) -> int:
+    # 64-bit DCT perceptual hash of an image, as an int
+    with Image.open(io.BytesIO(data)) as img:
+        return int(str(imagehash.phash(img)), 16)
+
+class AvatarStore:
+    """
+    Content-addressed avatar hashes: sha256(image bytes) -> phash, plus the
+    URLs each image was seen at. The same picture behind two URLs is hashed
+    once, and a multi-index hash table over every phash seen answers "which
+    known avatars look like this one" across cases. Persisted to SQLite when a path is given.
+    """
+    def __init__(self, path: str = AVATAR_DB):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS images (digest TEXT PRIMARY KEY, phash INTEGER NOT NULL);
+            CREATE TABLE IF NOT EXISTS urls (url TEXT PRIMARY KEY, digest TEXT NOT NULL);
+        """)
+        self.by_digest: Dict[str, int] = {}
+        self.by_url: Dict[str, str] = {}
+        self.urls: Dict[str, Set[str]] = {}  # digest -> urls serving it
+        self.index = HashIndex(AVATAR_RADIUS)  # phash -> digest
+        for digest, h in self._db.execute("SELECT digest, phash FROM images"):
+            h = to_unsigned(h)
+            self.by_digest[digest] = h
+            self.index.add(h, digest)
+        for url, digest in self._db.execute("SELECT url, digest FROM urls"):
+            self._link(url, digest)
+
+    def _link(self, url: str, digest: str):
+        old = self.by_url.get(url)
+        if old is not None and old != digest:
+            self.urls[old].discard(url)
+        self.by_url[url] = digest
+        self.urls.setdefault(digest, set()).add(url)
+
+    def hash_for_url(self, url: str) -> Optional[int]:
+        digest = self.by_url.get(url)
+        return None if digest is None else self.by_digest.get(digest)
+
+    def hash_for_digest(self, digest: str) -> Optional[int]:
+        return self.by_digest.get(digest)
+
+    def put(self, url: str, digest: str, h: int):
+        self.remember(url, digest, h)
+        self.save(url, digest, h)
+
+    def remember(self, url: str, digest: str, h: int):
+        # in-memory maps and index only; cheap, and safe to call on the event loop
+        with self._lock:
+            if digest not in self.by_digest:
+                self.by_digest[digest] = h
+                self.index.add(h, digest)
+            self._link(url, digest)
+
+    def save(self, url: str, digest: str, h: int):
+        # blocking SQLite write + commit; run it off the event loop
+        with self._lock:
+            self._db.execute("INSERT OR IGNORE INTO images VALUES (?, ?)", (digest, to_signed(h)))
+            self._db.execute("INSERT OR REPLACE INTO urls VALUES (?, ?)", (url, digest))
+            self._db.commit()
+
+    def similar(self, h: int, radius: int = AVATAR_RADIUS) -> List[Tuple[str, int]]:
+        """
+        (url, distance) for every stored avatar within radius (<= AVATAR_RADIUS) of h.
+        """
+        return [(url, d) for digest, d in self.index.query(h, radius)
+                for url in sorted(self.urls.get(digest, ()))]
+
+    def close(self):
+        self._db.close()
+
+STORE = AvatarStore()
+
+async def _download(url: str, client: httpx.AsyncClient,
+                    max_bytes: int = MAX_AVATAR_BYTES) -> Optional[bytes]:
+    # Stream the image and give up as soon as it is known to exceed max_bytes
+    try:
+        async with client.stream("GET", url, headers={"Accept": "image/*"}) as r:
+            if r.status_code != 200:
+                return None
+            if int(r.headers.get("Content-Length") or 0) > max_bytes:
+                return None
+            body = bytearray()
+            async for chunk in r.aiter_bytes():
+                body += chunk
+                if len(body) > max_bytes:
+                    return None
+            return bytes(body)
+    except (httpx.HTTPError, ValueError):
+        return None
+
+async def _fetch_hash(url: str, client: httpx.AsyncClient, store: AvatarStore) -> Optional[int]:
+    data = await _download(url, client)
+    if data is None:
+        return None
+    digest = hashlib.sha256(data).hexdigest()
+    loop = asyncio.get_running_loop()
+    h = store.hash_for_digest(digest)
+    if h is None:
+        try:
+            h = await loop.run_in_executor(None, phash64, data)  # CPU-bound decode + DCT
+        except Exception:
+            return None  # not an image Pillow can read
+    store.remember(url, digest, h)
+    await loop.run_in_executor(None, store.save, url, digest, h)
+    return h
+
+async def hash_avatars(urls: Iterable[Optional[str]], client: httpx.AsyncClient,
+                       store: AvatarStore = STORE,
+                       concurrency: int = AVATAR_CONCURRENCY) -> Dict[str, int]:
+    """
+    avatar_url -> phash for the given URLs, downloading each unknown URL once
+    with at most `concurrency` downloads in flight. Feed the result to
+    core.scoring.build_matches(..., avatar_hashes=...).
+    """
+    out: Dict[str, int] = {}
+    todo = []
+    for url in dict.fromkeys(u for u in urls if u):
+        h = store.hash_for_url(url)
+        if h is None:
+            todo.append(url)
+        else:
+            out[url] = h
+
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(url: str):
+        async with gate:
+            return await _fetch_hash(url, client, store)
+
+    for url, h in zip(todo, await asyncio.gather(*(one(u) for u in todo))):
+        if h is not None:
+            out[url] = h
+    return out
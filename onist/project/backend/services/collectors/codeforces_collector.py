@@ -1,10 +1,14 @@
-import requests
+import httpx
 
-def fetch_codeforces(username: str):
-    url = f"https://codeforces.com/api/user.info?handles={username}"
-    r = requests.get(url)
-    if r.status_code == 200:
-        data = r.json()["result"][0]
+from services.collectors.registry import register_collector
+from services.utils import BASE_URLS, get_json
+
+@register_collector("codeforces")
+async def fetch_codeforces(username: str, client: httpx.AsyncClient):
+    url = f"{BASE_URLS['codeforces']}/api/user.info"
+    data, status = await get_json(url, params={"handles": username}, client=client)
+    if status == 200 and data:
+        data = data["result"][0]
         return {
             "platform": "Codeforces",
             "username": data.get("handle"),
@@ -1,10 +1,13 @@
-import requests
+import httpx
 
-def fetch_devto(username: str):
-    url = f"https://dev.to/api/users/by_username?url={username}"
-    r = requests.get(url)
-    if r.status_code == 200:
-        data = r.json()
+from services.collectors.registry import register_collector
+from services.utils import BASE_URLS, get_json
+
+@register_collector("devto")
+async def fetch_devto(username: str, client: httpx.AsyncClient):
+    url = f"{BASE_URLS['devto']}/api/users/by_username"
+    data, status = await get_json(url, params={"url": username}, client=client)
+    if status == 200 and data:
         return {
             "platform": "Dev.to",
             "username": data.get("username"),
@@ -1,10 +1,13 @@
-import requests
+import httpx
 
-def fetch_github(username: str):
-    url = f"https://api.github.com/users/{username}"
-    r = requests.get(url)
-    if r.status_code == 200:
-        data = r.json()
+from services.collectors.registry import register_collector
+from services.utils import BASE_URLS, get_json
+
+@register_collector("github")
+async def fetch_github(username: str, client: httpx.AsyncClient):
+    url = f"{BASE_URLS['github']}/users/{username}"
+    data, status = await get_json(url, client=client)
+    if status == 200 and data:
         return {
             "platform": "GitHub",
             "username": data.get("login"),
@@ -1,11 +1,15 @@
-import requests
+import httpx
 
-def fetch_reddit(username: str):
-    url = f"https://www.reddit.com/user/{username}/about.json"
+from services.collectors.registry import register_collector
+from services.utils import BASE_URLS, get_json
+
+@register_collector("reddit")
+async def fetch_reddit(username: str, client: httpx.AsyncClient):
+    url = f"{BASE_URLS['reddit']}/user/{username}/about.json"
     headers = {"User-Agent": "Mozilla/5.0"}
-    r = requests.get(url, headers=headers)
-    if r.status_code == 200:
-        data = r.json()["data"]
+    data, status = await get_json(url, headers=headers, client=client)
+    if status == 200 and data:
+        data = data["data"]
         return {
             "platform": "Reddit",
             "username": data.get("name"),
@@ -0,0 +1,25 @@
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional
+
+DEFAULT_TIMEOUT = 15.0  # seconds a single collector may take
+
+
+@dataclass
+class CollectorSpec:
+    name: str
+    fn: Callable
+    timeout: float = DEFAULT_TIMEOUT
+
+
+# name -> spec; DiscoveryService runs every registered collector concurrently
+COLLECTORS: Dict[str, CollectorSpec] = {}
+
+
+def register_collector(name: str, timeout: Optional[float] = None):
+    """
+    Decorator: add a collector (sync or async, taking a username) to discovery.
+    """
+    def wrap(fn: Callable) -> Callable:
+        COLLECTORS[name] = CollectorSpec(name, fn, timeout or DEFAULT_TIMEOUT)
+        return fn
+    return wrap
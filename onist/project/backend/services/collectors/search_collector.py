@@ -1,20 +1,122 @@
+import asyncio
 import os
-import requests
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+from services.collectors.registry import register_collector
+from services.utils import BASE_URLS, get_json
 
 BING_KEY = os.getenv("BING_API_KEY")
-BING_URL = "https://api.bing.microsoft.com/v7.0/search"
+BING_URL = f"{BASE_URLS['bing']}/v7.0/search"
+
+SITES = ("instagram.com", "twitter.com", "linkedin.com", "facebook.com")
+PAGES = 2                 # result pages per site, fetched concurrently
+PAGE_SIZE = 50            # Bing's max `count`
+REQUEST_TIMEOUT = 8.0     # seconds per (query, page); a slow page is skipped
+CACHE_TTL = 3600.0        # seconds a (query, page) response is reused
+CACHE_SIZE = 1024
+
+# Query params that never change which page a URL points at
+TRACKING_PARAMS = {"ref", "ref_src", "ref_url", "igshid", "igsh", "fbclid", "gclid", "si", "s", "t"}
+
+def canonical_url(url: str) -> str:
+    """
+    Collapse the spellings of one result URL: scheme/host case, www./m.
+    prefixes, tracking params, fragments and trailing slashes.
+    """
+    parts = urlsplit(url.strip())
+    host = (parts.hostname or "").lower()
+    for prefix in ("www.", "m.", "mobile."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+            break
+    query = urlencode(sorted((k, v) for k, v in parse_qsl(parts.query)
+                             if k.lower() not in TRACKING_PARAMS and not k.lower().startswith("utm_")))
+    return urlunsplit(("https", host, parts.path.rstrip("/") or "/", query, ""))
+
+class PageCache:
+    """
+    (query, page) -> Bing web results, LRU-bounded with a TTL, so repeating a
+    search within CACHE_TTL costs no API quota.
+    """
+    def __init__(self, ttl: float = CACHE_TTL, size: int = CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self._items: "OrderedDict[Tuple[str, int], Tuple[float, List[dict]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
 
-def search_socials(username: str):
-    query = f"{username} site:instagram.com OR site:twitter.com OR site:linkedin.com OR site:facebook.com"
+    def get(self, key: Tuple[str, int]) -> Optional[List[dict]]:
+        item = self._items.get(key)
+        if item is None or item[0] < time.monotonic():
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return item[1]
+
+    def put(self, key: Tuple[str, int], value: List[dict]):
+        self._items[key] = (time.monotonic() + self.ttl, value)
+        self._items.move_to_end(key)
+        while len(self._items) > self.size:
+            self._items.popitem(last=False)
+
+PAGE_CACHE = PageCache()
+
+async def fetch_page(query: str, page: int, client: httpx.AsyncClient,
+                     cache: PageCache = PAGE_CACHE) -> List[dict]:
+    cached = cache.get((query, page))
+    if cached is not None:
+        return cached
     headers = {"Ocp-Apim-Subscription-Key": BING_KEY}
-    r = requests.get(BING_URL, headers=headers, params={"q": query})
-    results = []
-    if r.status_code == 200:
-        for web_page in r.json().get("webPages", {}).get("value", []):
-            results.append({
-                "platform": "Social",
-                "title": web_page["name"],
-                "snippet": web_page["snippet"],
-                "url": web_page["url"]
-            })
-    return results
+    params = {"q": query, "count": PAGE_SIZE, "offset": page * PAGE_SIZE}
+    try:
+        data, status = await asyncio.wait_for(
+            get_json(BING_URL, headers=headers, params=params, client=client), REQUEST_TIMEOUT)
+    except (asyncio.TimeoutError, httpx.HTTPError):
+        return []
+    if status != 200 or not data:
+        return []  # failures are not cached
+    pages = data.get("webPages", {}).get("value", [])
+    cache.put((query, page), pages)
+    return pages
+
+def site_queries(username: str) -> List[str]:
+    return [f"{username} site:{site}" for site in SITES]
+
+async def stream_socials(username: str, client: httpx.AsyncClient,
+                         pages: int = PAGES, cache: PageCache = PAGE_CACHE) -> AsyncIterator[dict]:
+    """
+    One query per site, every page of each in flight at once; results are
+    yielded as their page lands, first occurrence of each canonical URL only.
+    Yields nothing without BING_API_KEY: every call would be refused.
+    """
+    if not BING_KEY:
+        return
+    tasks = [asyncio.ensure_future(fetch_page(q, page, client, cache))
+             for q in site_queries(username) for page in range(pages)]
+    seen = set()
+    try:
+        for next_page in asyncio.as_completed(tasks):
+            for web_page in await next_page:
+                key = canonical_url(web_page["url"])
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield {
+                    "platform": "Social",
+                    "title": web_page["name"],
+                    "snippet": web_page["snippet"],
+                    "url": web_page["url"]
+                }
+    finally:
+        for task in tasks:
+            task.cancel()
+
+@register_collector("social_links")
+async def search_socials(username: str, client: httpx.AsyncClient):
+    return [result async for result in stream_socials(username, client)]
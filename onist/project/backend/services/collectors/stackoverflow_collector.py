@@ -1,5 +1,6 @@
-import requests
+from services.collectors.registry import register_collector
 
+@register_collector("stackoverflow")
 def fetch_stackoverflow(username: str):
     # StackOverflow requires numeric user_id, not username
     # Placeholder logic (needs API key for production)
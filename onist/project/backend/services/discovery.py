@@ -1,28 +1,65 @@
 # services/discovery.py
 
-from services.collectors.github import GitHubCollector
-from services.collectors.twitter import TwitterCollector
-from services.collectors.instagram import InstagramCollector
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+
+import httpx
+
+# Importing the collector modules registers them
+from services.collectors import (  # noqa: F401
+    codeforces_collector,
+    devto_collector,
+    github_collector,
+    reddit_collector,
+    search_collector,
+    stackoverflow_collector,
+)
+from services.collectors.registry import COLLECTORS, DEFAULT_TIMEOUT, CollectorSpec
+
+MAX_THREADS = 16  # worker threads shared by blocking (sync) collectors
+
 
-from services.collectors.github_collector import fetch_github_profile
 class DiscoveryService:
-    def __init__(self):
-        self.collectors = {
-            "github": GitHubCollector(),
-            "twitter": TwitterCollector(),
-            "instagram": InstagramCollector(),
-        }
-
-    def find_user(self, username: str):
+    def __init__(self, collectors: Optional[Dict[str, CollectorSpec]] = None,
+                 max_threads: int = MAX_THREADS,
+                 client: Optional[httpx.AsyncClient] = None):
+        self.client = client  # shared pooled client handed to HTTP collectors
+        self.collectors = dict(COLLECTORS if collectors is None else collectors)
+        self.executor = ThreadPoolExecutor(max_workers=max_threads,
+                                           thread_name_prefix="collector")
+
+    def register(self, name: str, fn, timeout: Optional[float] = None):
+        self.collectors[name] = CollectorSpec(name, fn, timeout or DEFAULT_TIMEOUT)
+
+    def _args(self, spec: CollectorSpec, username: str):
+        if "client" in inspect.signature(spec.fn).parameters:
+            return (username, self.client)
+        return (username,)
+
+    async def _run(self, spec: CollectorSpec, username: str):
+        args = self._args(spec, username)
+        if inspect.iscoroutinefunction(spec.fn):
+            call = spec.fn(*args)
+        else:
+            loop = asyncio.get_running_loop()
+            call = loop.run_in_executor(self.executor, spec.fn, *args)
+        try:
+            return await asyncio.wait_for(call, timeout=spec.timeout)
+        except asyncio.TimeoutError:
+            return {"error": f"timed out after {spec.timeout:g}s", "timed_out": True}
+        except Exception as e:
+            return {"error": str(e)}
+
+    async def find_user(self, username: str):
         """
-        Runs discovery across all collectors and aggregates results.
+        Runs discovery across all collectors concurrently and aggregates results.
+        Wall time is bounded by the slowest collector (or its timeout), not the sum.
         """
-        results = {}
-        for name, collector in self.collectors.items():
-            try:
-                data = collector.search(username)
-                if data:
-                    results[name] = data
-            except Exception as e:
-                results[name] = {"error": str(e)}
-        return results
+        names = list(self.collectors)
+        outputs = await asyncio.gather(*(self._run(self.collectors[n], username) for n in names))
+        return {name: data for name, data in zip(names, outputs) if data}
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,244 @@
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence
+from urllib.parse import urlparse
+
+from core.hashindex import to_signed
+from core.models import CaseResult, Cluster, Inputs, ProfileEvidence, ProfileMatch
+from services.normalize import normalize_email, normalize_many, normalize_phone
+
+EVIDENCE_DB = os.getenv("EVIDENCE_DB", "")  # SQLite path; "" keeps the store in memory
+BATCH_SIZE = 1000                           # evidence rows per insert transaction
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cases (
+    id INTEGER PRIMARY KEY,
+    created_at TEXT NOT NULL,
+    inputs TEXT NOT NULL,
+    matches TEXT NOT NULL,
+    clusters TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evidence (
+    id INTEGER PRIMARY KEY,
+    case_id INTEGER REFERENCES cases(id),
+    position INTEGER,
+    platform TEXT NOT NULL,
+    handle TEXT,
+    stored_at TEXT NOT NULL,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS evidence_emails (evidence_id INTEGER NOT NULL, email TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS evidence_phones (evidence_id INTEGER NOT NULL, phone TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS evidence_links (evidence_id INTEGER NOT NULL, domain TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS evidence_avatars (evidence_id INTEGER NOT NULL, phash INTEGER NOT NULL);
+
+CREATE INDEX IF NOT EXISTS evidence_case ON evidence (case_id, position);
+CREATE INDEX IF NOT EXISTS evidence_handle ON evidence (handle, platform);
+CREATE INDEX IF NOT EXISTS evidence_emails_key ON evidence_emails (email);
+CREATE INDEX IF NOT EXISTS evidence_phones_key ON evidence_phones (phone);
+CREATE INDEX IF NOT EXISTS evidence_links_key ON evidence_links (domain);
+CREATE INDEX IF NOT EXISTS evidence_avatars_key ON evidence_avatars (phash);
+"""
+
+class StoredEvidence(NamedTuple):
+    id: int
+    case_id: Optional[int]
+    evidence: ProfileEvidence
+
+class Prepared(NamedTuple):
+    # one insert batch with its emails / phones already normalized
+    batch: Sequence[ProfileEvidence]
+    emails: List[Optional[str]]
+    phones: List[Optional[str]]
+
+# Index keys: the same normalization everywhere, so lookups hit what inserts wrote
+
+def handle_key(handle: Optional[str]) -> Optional[str]:
+    if not handle:
+        return None
+    return handle.strip().lstrip("@").lower() or None
+
+def link_domain(url: str) -> Optional[str]:
+    host = urlparse(url if "//" in url else "//" + url).hostname
+    if not host:
+        return None
+    return host[4:] if host.startswith("www.") else host
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+class EvidenceStore:
+    """
+    Embedded SQLite store for cases and the evidence collected for them, with
+    secondary indexes on normalized email, E.164 phone, (handle, platform),
+    link domain and avatar phash, so "have we seen this before" is one indexed
+    lookup instead of a re-collection.
+    """
+    def __init__(self, path: str = EVIDENCE_DB, default_region: str = "IN"):
+        self.default_region = default_region
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path or ":memory:", check_same_thread=False)
+        if path:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(SCHEMA)
+
+    # -- writes --
+
+    @contextmanager
+    def _write(self):
+        # BEGIN IMMEDIATE takes SQLite's write lock up front, so ids read inside
+        # the transaction can't be handed out to another connection meanwhile
+        with self._lock, self._db:
+            self._db.execute("BEGIN IMMEDIATE")
+            yield
+
+    def save_case(self, case: CaseResult, avatar_hashes: Optional[Dict[str, int]] = None,
+                  batch_size: int = BATCH_SIZE) -> int:
+        """
+        Store a case and all of its evidence in one transaction; returns the case id.
+        """
+        profiles = list(case.profiles)
+        batches = [self._prepare(profiles[start:start + batch_size])
+                   for start in range(0, len(profiles), batch_size)]
+        with self._write():
+            cur = self._db.execute(
+                "INSERT INTO cases (created_at, inputs, matches, clusters) VALUES (?, ?, ?, ?)",
+                (_now(), case.inputs.model_dump_json(),
+                 json.dumps([m.model_dump() for m in case.matches]),
+                 json.dumps([c.model_dump() for c in case.clusters])),
+            )
+            case_id = cur.lastrowid
+            for batch in batches:
+                self._insert_batch(batch, case_id, avatar_hashes or {})
+        return case_id
+
+    def add_evidence(self, items: Iterable[ProfileEvidence], case_id: Optional[int] = None,
+                     avatar_hashes: Optional[Dict[str, int]] = None,
+                     batch_size: int = BATCH_SIZE) -> List[int]:
+        """
+        Bulk insert, BATCH_SIZE rows per transaction; returns the new evidence ids
+        in input order. Evidence with a case_id is appended after the case's
+        existing evidence, in input order.
+        """
+        items = list(items)
+        ids: List[int] = []
+        for start in range(0, len(items), batch_size):
+            batch = self._prepare(items[start:start + batch_size])
+            with self._write():
+                ids.extend(self._insert_batch(batch, case_id, avatar_hashes or {}))
+        return ids
+
+    def _prepare(self, batch: Sequence[ProfileEvidence]) -> Prepared:
+        # normalization runs before the write lock is taken
+        emails = normalize_many([e for p in batch for e in p.emails], kind="email", processes=1)
+        phones = normalize_many([x for p in batch for x in p.phones], kind="phone",
+                                default_region=self.default_region, processes=1)
+        return Prepared(batch, emails, phones)
+
+    def _insert_batch(self, prepared: Prepared, case_id: Optional[int],
+                      avatar_hashes: Dict[str, int]) -> List[int]:
+        # runs inside _write(), so MAX(id) and MAX(position) can't move under us
+        batch, emails, phones = prepared
+        now = _now()
+        first = self._db.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM evidence").fetchone()[0]
+        offset = None
+        if case_id is not None:
+            offset = self._db.execute("SELECT COALESCE(MAX(position), -1) + 1 FROM evidence "
+                                      "WHERE case_id = ?", (case_id,)).fetchone()[0]
+        ids = list(range(first, first + len(batch)))
+        rows, email_rows, phone_rows, link_rows, avatar_rows = [], [], [], [], []
+        e = x = 0
+        for k, (eid, p) in enumerate(zip(ids, batch)):
+            position = offset + k if offset is not None else None
+            rows.append((eid, case_id, position, p.platform, handle_key(p.handle), now,
+                         p.model_dump_json()))
+            for email in emails[e:e + len(p.emails)]:
+                if email:
+                    email_rows.append((eid, email))
+            e += len(p.emails)
+            for phone in phones[x:x + len(p.phones)]:
+                if phone:
+                    phone_rows.append((eid, phone))
+            x += len(p.phones)
+            for domain in {link_domain(u) for u in p.links + ([p.url] if p.url else [])}:
+                if domain:
+                    link_rows.append((eid, domain))
+            if p.avatar_url and p.avatar_url in avatar_hashes:
+                avatar_rows.append((eid, to_signed(avatar_hashes[p.avatar_url])))
+        self._db.executemany("INSERT INTO evidence VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+        self._db.executemany("INSERT INTO evidence_emails VALUES (?, ?)", email_rows)
+        self._db.executemany("INSERT INTO evidence_phones VALUES (?, ?)", phone_rows)
+        self._db.executemany("INSERT INTO evidence_links VALUES (?, ?)", link_rows)
+        self._db.executemany("INSERT INTO evidence_avatars VALUES (?, ?)", avatar_rows)
+        return ids
+
+    # -- reads --
+
+    def _evidence(self, where: str, args: tuple, order: str = "id") -> List[StoredEvidence]:
+        sql = f"SELECT id, case_id, data FROM evidence WHERE {where} ORDER BY {order}"
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        return [StoredEvidence(i, c, ProfileEvidence.model_validate_json(d)) for i, c, d in rows]
+
+    def by_email(self, email: str) -> List[StoredEvidence]:
+        key = normalize_email(email)
+        if not key:
+            return []
+        return self._evidence("id IN (SELECT evidence_id FROM evidence_emails WHERE email = ?)", (key,))
+
+    def by_phone(self, phone: str) -> List[StoredEvidence]:
+        key = normalize_phone(phone, self.default_region)
+        if not key:
+            return []
+        return self._evidence("id IN (SELECT evidence_id FROM evidence_phones WHERE phone = ?)", (key,))
+
+    def by_handle(self, handle: str, platform: Optional[str] = None) -> List[StoredEvidence]:
+        key = handle_key(handle)
+        if platform is None:
+            return self._evidence("handle = ?", (key,))
+        return self._evidence("handle = ? AND platform = ?", (key, platform))
+
+    def by_domain(self, url_or_domain: str) -> List[StoredEvidence]:
+        key = link_domain(url_or_domain)
+        return self._evidence("id IN (SELECT evidence_id FROM evidence_links WHERE domain = ?)", (key,))
+
+    def by_avatar(self, phash: int) -> List[StoredEvidence]:
+        # exact phash; near-duplicates go through services.avatars.AvatarStore.similar
+        return self._evidence("id IN (SELECT evidence_id FROM evidence_avatars WHERE phash = ?)",
+                              (to_signed(phash),))
+
+    def seen_phone(self, phone: str) -> bool:
+        key = normalize_phone(phone, self.default_region)
+        with self._lock:
+            return key is not None and self._db.execute(
+                "SELECT 1 FROM evidence_phones WHERE phone = ? LIMIT 1", (key,)).fetchone() is not None
+
+    def seen_handle(self, handle: str, platform: Optional[str] = None) -> bool:
+        sql, args = "SELECT 1 FROM evidence WHERE handle = ?", (handle_key(handle),)
+        if platform is not None:
+            sql, args = sql + " AND platform = ?", args + (platform,)
+        with self._lock:
+            return self._db.execute(sql + " LIMIT 1", args).fetchone() is not None
+
+    def load_case(self, case_id: int) -> Optional[CaseResult]:
+        with self._lock:
+            row = self._db.execute("SELECT inputs, matches, clusters FROM cases WHERE id = ?",
+                                   (case_id,)).fetchone()
+        if row is None:
+            return None
+        inputs, matches, clusters = row
+        profiles = [s.evidence for s in self._evidence("case_id = ?", (case_id,), "position")]
+        return CaseResult(
+            inputs=Inputs.model_validate_json(inputs),
+            profiles=profiles,
+            matches=[ProfileMatch.model_validate(m) for m in json.loads(matches)],
+            clusters=[Cluster.model_validate(c) for c in json.loads(clusters)],
+        )
+
+    def close(self):
+        self._db.close()
@@ -1,11 +1,67 @@
 from __future__ import annotations
-from typing import Optional
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 import phonenumbers
 from email_validator import validate_email, EmailNotValidError
 
+CACHE_SIZE = 100_000       # memoized results, keyed by (kind, value, region)
+POOL_MIN_UNIQUE = 20_000   # distinct values before normalize_many uses a process pool
+POOL_CHUNK = 5_000
+
+Key = Tuple[str, str, str]  # (kind, value, region); region is "" for emails
+_MISSING = object()
+
+class NormalizeCache:
+    """
+    Bounded LRU of normalized values shared by the single-value normalizers
+    and normalize_many, which checks it before fanning work out to a process
+    pool and fills it from the pool's results.
+    """
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self._items: "OrderedDict[Key, Optional[str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Key):
+        # the cached value (possibly None), or _MISSING
+        with self._lock:
+            value = self._items.get(key, _MISSING)
+            if value is _MISSING:
+                self.misses += 1
+            else:
+                self._items.move_to_end(key)
+                self.hits += 1
+            return value
+
+    def put(self, key: Key, value: Optional[str]):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = self.misses = 0
+
+CACHE = NormalizeCache()
+
+def _cached(key: Key, compute: Callable[[], Optional[str]]) -> Optional[str]:
+    value = CACHE.get(key)
+    if value is _MISSING:
+        value = compute()
+        CACHE.put(key, value)
+    return value
+
 # Email
 
-def normalize_email(email: Optional[str]) -> Optional[str]:
+def _email(email: Optional[str]) -> Optional[str]:
     if not email: return None
     try:
         v = validate_email(email, check_deliverability=False)
@@ -13,9 +69,13 @@ def normalize_email(email: Optional[str]) -> Optional[str]:
     except EmailNotValidError:
         return None
 
+def normalize_email(email: Optional[str]) -> Optional[str]:
+    if not email: return None
+    return _cached(("email", email, ""), lambda: _email(email))
+
 # Phone to E.164
 
-def normalize_phone(phone: Optional[str], default_region: str = "IN") -> Optional[str]:
+def _phone(phone: Optional[str], default_region: str = "IN") -> Optional[str]:
     if not phone: return None
     try:
         num = phonenumbers.parse(phone, default_region)
@@ -25,8 +85,65 @@ def normalize_phone(phone: Optional[str], default_region: str = "IN") -> Optiona
     except Exception:
         return None
 
+def normalize_phone(phone: Optional[str], default_region: str = "IN") -> Optional[str]:
+    if not phone: return None
+    return _cached(("phone", phone, default_region), lambda: _phone(phone, default_region))
+
 # Name/username simple cleanup
 
 def clean(s: Optional[str]) -> Optional[str]:
     if not s: return None
-    return " ".join(str(s).strip().split())
\ No newline at end of file
+    return " ".join(str(s).strip().split())
+
+# Bulk: dedupe, memoize, and fan large batches out to worker processes
+
+def _normalizer(kind: str, default_region: str) -> Callable[[Optional[str]], Optional[str]]:
+    # the uncached implementation; callers deal with CACHE themselves
+    if kind == "phone":
+        return lambda v: _phone(v, default_region)
+    if kind == "email":
+        return _email
+    raise ValueError(f"unknown kind: {kind!r} (expected 'phone' or 'email')")
+
+def _normalize_chunk(kind: str, default_region: str, chunk: List[str]) -> List[Optional[str]]:
+    fn = _normalizer(kind, default_region)
+    return [fn(v) for v in chunk]
+
+def normalize_many(values: Iterable[Optional[str]], kind: str = "phone",
+                   default_region: str = "IN",
+                   processes: Optional[int] = None) -> List[Optional[str]]:
+    """
+    Normalize a column of phones (kind="phone", to E.164) or emails
+    (kind="email"); output is aligned with the input. Each distinct value is
+    normalized once, and values already in CACHE not at all. Past
+    POOL_MIN_UNIQUE uncached distinct values the work is split across a
+    process pool (processes=1 keeps it in-process); results go into CACHE.
+    """
+    values = list(values)
+    fn = _normalizer(kind, default_region)
+    region = default_region if kind == "phone" else ""
+    done: Dict[str, Optional[str]] = {}
+    todo: List[str] = []
+    for v in dict.fromkeys(values):
+        if not v:
+            continue
+        cached = CACHE.get((kind, v, region))
+        if cached is _MISSING:
+            todo.append(v)
+        else:
+            done[v] = cached
+    workers = processes or os.cpu_count() or 1
+
+    if workers > 1 and len(todo) >= POOL_MIN_UNIQUE:
+        chunks = [todo[k:k + POOL_CHUNK] for k in range(0, len(todo), POOL_CHUNK)]
+        fresh: Dict[str, Optional[str]] = {}
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for chunk, out in zip(chunks, pool.map(_normalize_chunk, [kind] * len(chunks),
+                                                   [default_region] * len(chunks), chunks)):
+                fresh.update(zip(chunk, out))
+    else:
+        fresh = {v: fn(v) for v in todo}
+    for v, out in fresh.items():
+        CACHE.put((kind, v, region), out)
+    done.update(fresh)
+    return [done.get(v) if v else None for v in values]
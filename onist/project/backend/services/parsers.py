@@ -1,21 +1,120 @@
-from bs4 import BeautifulSoup
-from typing import Dict
+import asyncio
+import codecs
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Union
+
+import httpx
+from lxml import etree
+
+MAX_HEAD_BYTES = 64 * 1024   # stop reading a page after this much, head or not
+CHUNK_SIZE = 8 * 1024
+BATCH_CONCURRENCY = 8
+DEFAULT_ENCODING = "utf-8"   # for bytes with no declared charset, as httpx's response.text
+
+# Common og fields we care about, with their twitter:* fallbacks
+FIELDS = {
+    "title": ("og:title", "twitter:title"),
+    "description": ("og:description", "twitter:description"),
+    "image": ("og:image", "twitter:image"),
+}
+_WANTED = {key for keys in FIELDS.values() for key in keys}
+_PRIMARY = {keys[0] for keys in FIELDS.values()}
+
+class HeadParser:
+    """
+    Incremental <head> scanner: feed it chunks of a page and it collects
+    OpenGraph/Twitter <meta> tags until </head> (or <body>), or until every
+    og:* field has been seen. No tree is kept. Byte chunks are decoded with
+    `encoding` (the response charset); str chunks are used as they are.
+    """
+    def __init__(self, encoding: Optional[str] = DEFAULT_ENCODING):
+        self._parser = etree.HTMLPullParser(events=("start", "end"), encoding=_known(encoding))
+        self.meta: Dict[str, str] = {}
+        self.done = False
+
+    def feed(self, chunk: Union[bytes, str]) -> bool:
+        # Returns True once nothing more needs to be read
+        if self.done:
+            return True
+        self._parser.feed(chunk)
+        for event, el in self._parser.read_events():
+            if (event == "start" and el.tag == "body") or (event == "end" and el.tag == "head"):
+                self.done = True
+                break
+            if event == "end" and el.tag == "meta":
+                k = (el.get("property") or el.get("name") or "").strip().lower()
+                v = (el.get("content") or "").strip()
+                if k in _WANTED and v:
+                    self.meta.setdefault(k, v)
+                    if _PRIMARY <= self.meta.keys():
+                        self.done = True
+                        break
+            elif event == "end":
+                el.clear()  # nothing but the meta attributes is needed
+        return self.done
+
+    def result(self) -> Dict[str, str]:
+        return {field: next((self.meta[k] for k in keys if k in self.meta), "")
+                for field, keys in FIELDS.items()}
+
+def _known(encoding: Optional[str]) -> str:
+    # servers send charsets Python doesn't know (e.g. "utf8mb4"); fall back
+    try:
+        return codecs.lookup(encoding).name if encoding else DEFAULT_ENCODING
+    except LookupError:
+        return DEFAULT_ENCODING
+
+def parse_head(chunks: Iterable[Union[bytes, str]],
+               encoding: Optional[str] = DEFAULT_ENCODING) -> Dict[str, str]:
+    head = HeadParser(encoding)
+    for chunk in chunks:
+        if head.feed(chunk):
+            break
+    return head.result()
 
 # Parse OpenGraph/meta from an HTML response text
 
 def parse_metadata(html: str) -> Dict[str, str]:
-    soup = BeautifulSoup(html, "lxml")
-    meta = {}
-    for tag in soup.find_all("meta"):
-        k = (tag.get("property") or tag.get("name") or "").strip().lower()
-        v = (tag.get("content") or "").strip()
-        if not k or not v:
-            continue
-        meta[k] = v
-    # Common og fields we care about
-    out = {
-        "title": meta.get("og:title") or meta.get("twitter:title") or "",
-        "description": meta.get("og:description") or meta.get("twitter:description") or "",
-        "image": meta.get("og:image") or meta.get("twitter:image") or "",
-    }
-    return out
\ No newline at end of file
+    return parse_head(html[k:k + CHUNK_SIZE] for k in range(0, len(html), CHUNK_SIZE))
+
+# Streaming fetch: read only as much of the page as the head needs
+
+async def _head_chunks(response: httpx.Response, max_bytes: int) -> AsyncIterator[bytes]:
+    read = 0
+    async for chunk in response.aiter_bytes(CHUNK_SIZE):
+        yield chunk[:max_bytes - read]
+        read += len(chunk)
+        if read >= max_bytes:
+            return
+
+async def fetch_metadata(url: str, client: httpx.AsyncClient,
+                         max_bytes: int = MAX_HEAD_BYTES) -> Optional[Dict[str, str]]:
+    """
+    Stream a page and return its og/twitter title, description and image;
+    the connection is released as soon as the head has been read.
+    None if the page could not be fetched.
+    """
+    try:
+        async with client.stream("GET", url, headers={"Accept": "text/html"}) as r:
+            if r.status_code != 200:
+                return None
+            head = HeadParser(r.charset_encoding)  # Content-Type charset, else DEFAULT_ENCODING
+            async for chunk in _head_chunks(r, max_bytes):
+                if head.feed(chunk):
+                    break
+            return head.result()
+    except httpx.HTTPError:
+        return None
+
+async def fetch_metadata_many(urls: List[str], client: httpx.AsyncClient,
+                              concurrency: int = BATCH_CONCURRENCY,
+                              max_bytes: int = MAX_HEAD_BYTES) -> Dict[str, Optional[Dict[str, str]]]:
+    # Batch form: unique URLs, at most `concurrency` pages streaming at once
+    gate = asyncio.Semaphore(concurrency)
+
+    async def one(url: str):
+        async with gate:
+            return await fetch_metadata(url, client, max_bytes)
+
+    unique = list(dict.fromkeys(urls))
+    results = await asyncio.gather(*(one(u) for u in unique))
+    return dict(zip(unique, results))
@@ -1,16 +1,61 @@
+import os
 import httpx
 import datetime as dt
 from typing import Optional, Tuple
 
 DEFAULT_TIMEOUT = httpx.Timeout(12.0, connect=5.0)
 
-async def get_json(url: str, headers: Optional[dict] = None) -> Tuple[Optional[dict], Optional[int]]:
-    async with httpx.AsyncClient(timeout=DEFAULT_TIMEOUT, headers=headers) as client:
-        r = await client.get(url)
-        try:
-            return r.json(), r.status_code
-        except Exception:
-            return None, r.status_code
+# Shared client pool: keep-alive connections reused across collectors/requests
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=100,
+    max_keepalive_connections=20,
+    keepalive_expiry=30.0,
+)
+
+DEFAULT_HEADERS = {
+    "Accept": "application/json",
+    "User-Agent": "onist/1.0",
+}
+
+# Upstream API roots. OSINT_UPSTREAM_BASE points every collector at a local
+# stand-in (e.g. http://127.0.0.1:8081 -> http://127.0.0.1:8081/github).
+BASE_URLS = {
+    "github": "https://api.github.com",
+    "reddit": "https://www.reddit.com",
+    "devto": "https://dev.to",
+    "codeforces": "https://codeforces.com",
+    "bing": "https://api.bing.microsoft.com",
+}
+
+_UPSTREAM_BASE = os.getenv("OSINT_UPSTREAM_BASE")
+if _UPSTREAM_BASE:
+    BASE_URLS = {k: f"{_UPSTREAM_BASE.rstrip('/')}/{k}" for k in BASE_URLS}
+
+def create_client() -> httpx.AsyncClient:
+    """
+    One pooled HTTP/1.1 + HTTP/2 client, meant to live for the whole process
+    (created and closed by the app lifespan) and be passed to every collector.
+    """
+    return httpx.AsyncClient(
+        http2=True,
+        timeout=DEFAULT_TIMEOUT,
+        limits=DEFAULT_LIMITS,
+        headers=DEFAULT_HEADERS,
+        follow_redirects=True,
+    )
+
+async def get_json(url: str, headers: Optional[dict] = None,
+                   params: Optional[dict] = None,
+                   client: Optional[httpx.AsyncClient] = None) -> Tuple[Optional[dict], Optional[int]]:
+    # Reuse the caller's pooled client when given; otherwise open a one-off one.
+    if client is None:
+        async with create_client() as own:
+            return await get_json(url, headers, params, own)
+    r = await client.get(url, headers=headers, params=params)
+    try:
+        return r.json(), r.status_code
+    except Exception:
+        return None, r.status_code
 
 def now_iso() -> str:
-    return dt.datetime.utcnow().isoformat() + "Z"
\ No newline at end of file
+    return dt.datetime.utcnow().isoformat() + "Z"
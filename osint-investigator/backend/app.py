@@ -1,33 +1,257 @@
 import asyncio
-from flask import Flask, request, jsonify
-from flask_cors import CORS
+import json
+import time
 
-from services.aggregator import aggregate_results
+from aiohttp import web
 
-app = Flask(__name__)
-CORS(app)
+from services.aggregator import aggregate_results, stream_results
+from services.batch import BATCH_CONCURRENCY, BatchRegistry, parse_usernames
+from services.breaker import BREAKERS
+from services.cache import RESPONSE_CACHE
+from services.hedging import HEDGER
+from services.metrics import METRICS, render_stats
+from services.providers import CODEFORCES_BATCHER, GITHUB_BATCHER
+from services.ratelimit import SCHEDULER
+from services.session import create_session
+from services.singleflight import FLIGHTS
 
-@app.get("/health")
-def health():
-    return {"status": "ok"}
+SESSION = web.AppKey("session")
+BATCHES = web.AppKey("batches")
+BATCH_LIMITER = web.AppKey("batch_limiter")
 
-@app.post("/search")
-def search():
-    data = request.get_json(silent=True) or {}
+@web.middleware
+async def cors(request: web.Request, handler):
+    if request.method == "OPTIONS":
+        return web.Response()
+    return await handler(request)
+
+async def cors_headers(request: web.Request, resp: web.StreamResponse):
+    # Runs on prepare, so streamed responses get the headers too
+    resp.headers["Access-Control-Allow-Origin"] = "*"
+    resp.headers["Access-Control-Allow-Headers"] = "Content-Type"
+    resp.headers["Access-Control-Allow-Methods"] = "GET, POST, DELETE, OPTIONS"
+    resp.headers["Access-Control-Expose-Headers"] = "X-Batch-Id"
+
+async def http_session(app: web.Application):
+    # One pooled client session for the lifetime of the process
+    app[SESSION] = create_session()
+    yield
+    await app[SESSION].close()
+
+async def response_cache(app: web.Application):
+    await RESPONSE_CACHE.purge_expired()
+    yield
+    RESPONSE_CACHE.close()
+
+routes = web.RouteTableDef()
+
+MAX_DEADLINE_MS = 60_000
+
+def parse_deadline(raw):
+    """
+    Request latency budget in ms (body/query "deadline_ms" or X-Deadline-Ms) -> seconds.
+    """
+    if raw in (None, ""):
+        return None
+    try:
+        ms = float(raw)
+    except (TypeError, ValueError):
+        raise ValueError("deadline_ms must be a number")
+    if ms <= 0:
+        raise ValueError("deadline_ms must be positive")
+    return min(ms, MAX_DEADLINE_MS) / 1000.0
+
+def request_deadline(request: web.Request, value):
+    # The body/query value wins when present at all: 0 is rejected, not skipped
+    return parse_deadline(value if value is not None else request.headers.get("X-Deadline-Ms"))
+
+@routes.get("/health")
+async def health(request: web.Request):
+    breakers = BREAKERS.snapshot()
+    degraded = any(b["state"] != "closed" for b in breakers.values())
+    return web.json_response({
+        "status": "degraded" if degraded else "ok",
+        "providers": breakers,
+    })
+
+@routes.get("/cache/stats")
+async def cache_stats(request: web.Request):
+    return web.json_response(RESPONSE_CACHE.snapshot())
+
+@routes.get("/ratelimit/stats")
+async def ratelimit_stats(request: web.Request):
+    return web.json_response(SCHEDULER.snapshot())
+
+@routes.get("/singleflight/stats")
+async def singleflight_stats(request: web.Request):
+    return web.json_response(FLIGHTS.snapshot())
+
+@routes.get("/metrics")
+async def metrics(request: web.Request):
+    body = (METRICS.render()
+            + render_stats("osint_cache", RESPONSE_CACHE.snapshot())
+            + render_stats("osint_singleflight", FLIGHTS.snapshot())
+            + render_stats("osint_ratelimit", SCHEDULER.stats)
+            + render_stats("osint_microbatch_codeforces", CODEFORCES_BATCHER.stats)
+            + render_stats("osint_microbatch_github", GITHUB_BATCHER.stats)
+            + render_stats("osint_hedging", HEDGER.stats))
+    return web.Response(text=body, content_type="text/plain", charset="utf-8",
+                        headers={"X-Prometheus-Format": "0.0.4"})
+
+@routes.post("/search")
+async def search(request: web.Request):
+    try:
+        data = await request.json()
+    except Exception:
+        data = None
+    data = data if isinstance(data, dict) else {}
     username = (data.get("username") or "").strip()
 
     if not username:
-        return jsonify({"error": "username is required"}), 400
+        return web.json_response({"error": "username is required"}, status=400)
 
-    # run all providers concurrently
-    results = asyncio.run(aggregate_results(username))
+    try:
+        deadline = request_deadline(request, data.get("deadline_ms"))
+    except ValueError as e:
+        return web.json_response({"error": str(e)}, status=400)
 
-    return jsonify({
+    # run all providers concurrently on the shared session
+    results = await aggregate_results(username, request.app[SESSION], deadline)
+
+    return web.json_response({
         "username": username,
         "count": len([r for r in results if r.get("exists")]),
+        "partial": any(r.get("timed_out") for r in results),
+        "timings": {r.get("platform"): r.get("elapsed_ms") for r in results},
         "results": results
     })
 
+def sse(event: str, data) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
+@routes.get("/search/stream")
+async def search_stream(request: web.Request):
+    username = (request.query.get("username") or "").strip()
+    if not username:
+        return web.json_response({"error": "username is required"}, status=400)
+    try:
+        deadline = request_deadline(request, request.query.get("deadline_ms"))
+    except ValueError as e:
+        return web.json_response({"error": str(e)}, status=400)
+
+    resp = web.StreamResponse(headers={
+        "Content-Type": "text/event-stream",
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no",
+    })
+    await resp.prepare(request)
+
+    # one "result" event per provider as it completes, then a "summary"
+    start = time.perf_counter()
+    count = total = timed_out = 0
+    first_ms = None
+    async for result in stream_results(username, request.app[SESSION], deadline):
+        if first_ms is None:
+            first_ms = round((time.perf_counter() - start) * 1000, 1)
+        total += 1
+        count += 1 if result.get("exists") else 0
+        timed_out += 1 if result.get("timed_out") else 0
+        await resp.write(sse("result", result))
+    await resp.write(sse("summary", {
+        "username": username,
+        "count": count,
+        "providers": total,
+        "timed_out": timed_out,
+        "first_result_ms": first_ms,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 1),
+    }))
+    await resp.write_eof()
+    return resp
+
+async def read_usernames(request: web.Request):
+    # Accepts a JSON list / {"usernames": [...]}, a text body, or a multipart "file" upload
+    if request.content_type == "multipart/form-data":
+        reader = await request.multipart()
+        async for part in reader:
+            if part.name == "file":
+                text = (await part.read()).decode("utf-8", errors="ignore")
+                return parse_usernames(text.splitlines())
+        return []
+    if request.content_type == "application/json":
+        try:
+            data = await request.json()
+        except Exception:
+            return []
+        if isinstance(data, dict):
+            data = data.get("usernames")
+        return parse_usernames(data) if isinstance(data, list) else []
+    return parse_usernames((await request.text()).splitlines())
+
+async def stream_batch(request: web.Request, job) -> web.StreamResponse:
+    resp = web.StreamResponse(headers={
+        "Content-Type": "application/x-ndjson",
+        "X-Batch-Id": job.id,
+    })
+    await resp.prepare(request)
+    await resp.write((json.dumps({"batch": job.progress()}) + "\n").encode())
+    records = job.run(request.app[SESSION], request.app[BATCH_LIMITER])
+    try:
+        async for record in records:
+            await resp.write((json.dumps(record) + "\n").encode())
+    finally:
+        await records.aclose()  # a failed write cancels the job now, not at garbage collection
+    await resp.write((json.dumps({"batch": job.progress()}) + "\n").encode())
+    await resp.write_eof()
+    return resp
+
+@routes.post("/search/batch")
+async def search_batch(request: web.Request):
+    usernames = await read_usernames(request)
+    if not usernames:
+        return web.json_response({"error": "usernames are required"}, status=400)
+    job = request.app[BATCHES].create(usernames)
+    return await stream_batch(request, job)
+
+@routes.get("/search/batch/{batch_id}")
+async def batch_progress(request: web.Request):
+    job = request.app[BATCHES].get(request.match_info["batch_id"])
+    if job is None:
+        return web.json_response({"error": "unknown batch"}, status=404)
+    return web.json_response(job.progress())
+
+@routes.delete("/search/batch/{batch_id}")
+async def batch_cancel(request: web.Request):
+    job = request.app[BATCHES].get(request.match_info["batch_id"])
+    if job is None:
+        return web.json_response({"error": "unknown batch"}, status=404)
+    job.cancel()
+    return web.json_response(job.progress())
+
+@routes.post("/search/batch/{batch_id}/resume")
+async def batch_resume(request: web.Request):
+    job = request.app[BATCHES].get(request.match_info["batch_id"])
+    if job is None:
+        return web.json_response({"error": "unknown batch"}, status=404)
+    if job.status in ("running", "completed"):
+        return web.json_response({"error": f"batch is {job.status}"}, status=409)
+    return await stream_batch(request, job)
+
+async def batch_state(app: web.Application):
+    app[BATCHES] = BatchRegistry()
+    app[BATCH_LIMITER] = asyncio.Semaphore(BATCH_CONCURRENCY)
+    yield
+
+def create_app() -> web.Application:
+    app = web.Application(middlewares=[cors])
+    app.on_response_prepare.append(cors_headers)
+    app.cleanup_ctx.append(http_session)
+    app.cleanup_ctx.append(response_cache)
+    app.cleanup_ctx.append(batch_state)
+    app.add_routes(routes)
+    return app
+
+app = create_app()
+
 if __name__ == "__main__":
     # Dev server
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    web.run_app(app, host="0.0.0.0", port=5000)
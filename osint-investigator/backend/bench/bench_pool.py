@@ -0,0 +1,77 @@
+"""
+Before/after benchmark for /search: per-request event loop + ClientSession
+(the old Flask handler) versus one pooled session on a long-lived loop.
+
+Runs against bench.stub_upstream, so no real upstream is contacted. The
+stand-in is plain HTTP, so TLS handshake savings are not included here.
+
+    python -m bench.bench_pool --searches 300 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PORT = int(os.getenv("BENCH_PORT", "8081"))
+os.environ.setdefault("OSINT_UPSTREAM_BASE", f"http://127.0.0.1:{PORT}")
+os.environ.setdefault("OSINT_CACHE_DB", "")  # measure the network path, not the disk cache
+os.environ.setdefault("OSINT_RATE_LIMIT", "0")  # the stand-in has no upstream quota
+
+from bench import stub_upstream  # noqa: E402
+from bench.common import latency_line  # noqa: E402
+from services.aggregator import aggregate_results  # noqa: E402
+from services.session import create_session  # noqa: E402
+
+def report(label, latencies, wall):
+    print(f"{label:<10} {len(latencies) / wall:8.1f} req/s   {latency_line(latencies)}")
+
+def run_before(usernames, concurrency):
+    # Old handler: asyncio.run + a fresh ClientSession per request, on worker threads
+    def one(u):
+        t = time.perf_counter()
+        asyncio.run(aggregate_results(u))
+        return time.perf_counter() - t
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = list(pool.map(one, usernames))
+    return latencies, time.perf_counter() - start
+
+async def run_after(usernames, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    # Every provider maps to the same stand-in host, so lift the per-host cap
+    session = create_session(limit_per_host=0)
+
+    async def one(u):
+        async with sem:
+            t = time.perf_counter()
+            await aggregate_results(u, session)
+            return time.perf_counter() - t
+
+    try:
+        start = time.perf_counter()
+        latencies = await asyncio.gather(*(one(u) for u in usernames))
+        return latencies, time.perf_counter() - start
+    finally:
+        await session.close()
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--searches", type=int, default=300)
+    ap.add_argument("--concurrency", type=int, default=16)
+    ap.add_argument("--latency", type=float, default=0.02, help="stand-in latency (s)")
+    args = ap.parse_args()
+
+    stub_upstream.LATENCY = args.latency
+    stub_upstream.start_in_thread(PORT)
+    # Distinct handles per mode so neither run is served from the response cache
+    before = [f"before{i}" for i in range(args.searches)]
+    after = [f"after{i}" for i in range(args.searches)]
+
+    print(f"{args.searches} searches x 7 providers, concurrency {args.concurrency}")
+    report("before", *run_before(before, args.concurrency))
+    report("after", *asyncio.run(run_after(after, args.concurrency)))
+
+if __name__ == "__main__":
+    main()
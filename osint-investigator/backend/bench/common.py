@@ -0,0 +1,38 @@
+"""
+Shared reporting helpers for the benchmark scripts.
+"""
+import os
+import resource
+import statistics
+
+
+def percentile(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = max(0, min(len(values) - 1, int(round(p / 100.0 * len(values))) - 1))
+    return values[k]
+
+
+def latency_line(latencies) -> str:
+    return (f"p50 {percentile(latencies, 50) * 1000:7.1f} ms   "
+            f"p95 {percentile(latencies, 95) * 1000:7.1f} ms   "
+            f"p99 {percentile(latencies, 99) * 1000:7.1f} ms   "
+            f"mean {statistics.mean(latencies) * 1000 if latencies else 0.0:7.1f} ms")
+
+
+def rss_mb() -> float:
+    """
+    Current resident set size in MiB (Linux /proc; falls back to peak RSS).
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            pages = int(f.read().split()[1])
+        return pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, IndexError):
+        return peak_rss_mb()
+
+
+def peak_rss_mb() -> float:
+    # ru_maxrss is KiB on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
@@ -0,0 +1,221 @@
+"""
+Offline load test for the osint-investigator API and the onist collectors.
+
+Starts bench.stub_upstream (in a thread) and the real app (create_app) on
+local ports, then drives it over HTTP:
+
+  single  N x POST /search at a fixed concurrency
+  batch   one POST /search/batch with N usernames, consuming the NDJSON stream
+
+or, without the app, calls onist's DiscoveryService.find_user directly:
+
+  onist   N x find_user at a fixed concurrency, on one pooled httpx client
+
+and reports requests/sec, p50/p95/p99 latency, outcome counts and RSS.
+Caching and the local token buckets are off by default so every lookup
+reaches the stand-in; pass --cache / --rate-limit to include them.
+
+    python -m bench.loadtest single --requests 500 --concurrency 32 \\
+        --latency lognormal:0.05,0.6 --throttle-rate 0.01
+    python -m bench.loadtest batch --usernames 2000
+    python -m bench.loadtest onist --requests 500 --concurrency 32
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from bench.common import latency_line, peak_rss_mb, rss_mb
+
+# onist's backend in this checkout; its services package shadows ours in "onist" runs
+ONIST_ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                          "..", "..", "..", "onist", "project", "backend")
+
+
+def parse_args():
+    from bench.stub_upstream import add_profile_args
+
+    ap = argparse.ArgumentParser()
+    ap.add_argument("scenario", choices=["single", "batch", "onist"])
+    ap.add_argument("--requests", type=int, default=300, help="single/onist: number of searches")
+    ap.add_argument("--concurrency", type=int, default=16, help="single/onist: searches in flight")
+    ap.add_argument("--usernames", type=int, default=1000, help="batch: usernames per batch")
+    ap.add_argument("--repeat-ratio", type=float, default=0.0,
+                    help="fraction of searches that reuse an earlier handle")
+    ap.add_argument("--stub-port", type=int, default=8081)
+    ap.add_argument("--app-port", type=int, default=8090)
+    ap.add_argument("--cache", action="store_true", help="keep the response cache on")
+    ap.add_argument("--rate-limit", action="store_true", help="keep the token buckets on")
+    ap.add_argument("--onist-root", default=ONIST_ROOT, help="onist: path to onist/project/backend")
+    add_profile_args(ap)
+    return ap.parse_args()
+
+
+def configure_env(args):
+    # Must run before services.* is imported: these are read at import time
+    os.environ["OSINT_UPSTREAM_BASE"] = f"http://127.0.0.1:{args.stub_port}"
+    if not args.cache:
+        os.environ["OSINT_CACHE_DB"] = ""
+    if not args.rate_limit:
+        os.environ["OSINT_RATE_LIMIT"] = "0"
+    if args.scenario == "onist":
+        # the stand-in accepts any key; without one the Bing collector is skipped
+        os.environ.setdefault("BING_API_KEY", "stub")
+        if "services" in sys.modules:
+            sys.exit("services already imported; run the onist scenario as its own process")
+        sys.path.insert(0, os.path.abspath(args.onist_root))
+
+
+def handles(n, repeat_ratio):
+    import random
+
+    out = []
+    for i in range(n):
+        if out and random.random() < repeat_ratio:
+            out.append(random.choice(out))
+        else:
+            out.append(f"load{i}")
+    return out
+
+
+async def run_single(client, base, names, concurrency):
+    sem = asyncio.Semaphore(concurrency)
+    latencies, outcomes = [], Counter()
+
+    async def one(u):
+        async with sem:
+            t = time.perf_counter()
+            async with client.post(f"{base}/search", json={"username": u}) as resp:
+                body = await resp.json()
+            latencies.append(time.perf_counter() - t)
+            for r in body.get("results", []):
+                outcomes[outcome(r)] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one(u) for u in names))
+    wall = time.perf_counter() - start
+    print(f"single     {len(names) / wall:8.1f} req/s   {latency_line(latencies)}")
+    return outcomes
+
+
+async def run_batch(client, base, names):
+    outcomes = Counter()
+    gaps, first, last = [], None, None
+    start = time.perf_counter()
+    async with client.post(f"{base}/search/batch", json={"usernames": names}) as resp:
+        async for line in resp.content:
+            rec = json.loads(line)
+            if "batch" in rec:
+                continue
+            now = time.perf_counter()
+            if first is None:
+                first = now - start
+            if last is not None:
+                gaps.append(now - last)
+            last = now
+            outcomes[outcome(rec)] += 1
+    wall = time.perf_counter() - start
+    n = sum(outcomes.values())
+    print(f"batch      {n / wall:8.1f} lookups/s   {len(names) / wall:8.1f} usernames/s   "
+          f"first record {first * 1000 if first else 0:.1f} ms   wall {wall:.2f} s")
+    print(f"           record gaps: {latency_line(gaps)}")
+    return outcomes
+
+
+async def run_onist(names, concurrency):
+    # onist's services (ONIST_ROOT is first on sys.path in this mode)
+    from services.discovery import DiscoveryService
+    from services.utils import create_client
+
+    sem = asyncio.Semaphore(concurrency)
+    latencies, outcomes = [], Counter()
+    async with create_client() as client:
+        service = DiscoveryService(client=client)
+
+        async def one(u):
+            async with sem:
+                t = time.perf_counter()
+                found = await service.find_user(u)
+                latencies.append(time.perf_counter() - t)
+                for name in service.collectors:
+                    outcomes[onist_outcome(found.get(name))] += 1
+
+        try:
+            start = time.perf_counter()
+            await asyncio.gather(*(one(u) for u in names))
+            wall = time.perf_counter() - start
+        finally:
+            service.close()
+    print(f"onist      {len(names) / wall:8.1f} req/s   {latency_line(latencies)}")
+    return outcomes
+
+
+def onist_outcome(data):
+    # find_user drops empty results, so a missing collector found nothing
+    if not data:
+        return "not_found"
+    if isinstance(data, dict) and data.get("timed_out"):
+        return "timed_out"
+    if isinstance(data, dict) and "error" in data:
+        return "error"
+    return "found"
+
+
+def outcome(rec):
+    from services.metrics import outcome as classify
+
+    return classify(rec)
+
+
+async def main(args):
+    import aiohttp
+    from aiohttp import web
+
+    from bench import stub_upstream
+
+    profile = stub_upstream.profile_from_args(args)
+    stub_upstream.start_in_thread(args.stub_port, profile)
+
+    if args.scenario == "onist":
+        rss_before = rss_mb()
+        outcomes = await run_onist(handles(args.requests, args.repeat_ratio), args.concurrency)
+        report(outcomes, profile, rss_before)
+        return
+
+    from app import create_app
+
+    runner = web.AppRunner(create_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", args.app_port).start()
+    base = f"http://127.0.0.1:{args.app_port}"
+
+    rss_before = rss_mb()
+    connector = aiohttp.TCPConnector(limit=0)
+    timeout = aiohttp.ClientTimeout(total=None)
+    try:
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout) as client:
+            if args.scenario == "single":
+                outcomes = await run_single(client, base, handles(args.requests, args.repeat_ratio),
+                                            args.concurrency)
+            else:
+                outcomes = await run_batch(client, base, handles(args.usernames, args.repeat_ratio))
+    finally:
+        await runner.cleanup()
+
+    report(outcomes, profile, rss_before)
+
+
+def report(outcomes, profile, rss_before):
+    print(f"outcomes   {dict(outcomes)}")
+    print(f"upstream   {dict(sorted(profile.served.items()))}")
+    print(f"memory     rss {rss_mb():.1f} MiB (+{rss_mb() - rss_before:.1f} during run)   "
+          f"peak {peak_rss_mb():.1f} MiB")
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    configure_env(args)
+    asyncio.run(main(args))
@@ -0,0 +1,255 @@
+"""
+Local stand-in for the upstream provider APIs.
+
+Routes mirror providers.BASE_URLS when OSINT_UPSTREAM_BASE points here,
+e.g. /github/users/<name>, /codeforces/api/user.info?handles=a;b, plus
+/bing/v7.0/search for the onist search collector. Handles exist unless a
+not-found fault is drawn; on the batch endpoints (GitHub GraphQL, Codeforces
+multi-handle) handles starting with "missing" do not exist.
+
+Latency is a distribution spec, globally or per provider:
+    fixed:0.02   uniform:0.01,0.2   exp:0.05   lognormal:0.05,0.6 (median, sigma)
+Faults are drawn per request: 5xx errors, 429 (+ Retry-After) and 404s.
+
+    python -m bench.stub_upstream --port 8081 --latency lognormal:0.05,0.6 \\
+        --latency reddit=uniform:0.5,3 --error-rate 0.01 --throttle-rate 0.02
+"""
+import argparse
+import asyncio
+import math
+import random
+import re
+import threading
+from collections import Counter
+from typing import Callable, Dict, Optional
+
+from aiohttp import web
+
+LATENCY = 0.02           # seconds, used when no distribution is configured
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    Turn a "kind:args" spec into a sampler returning seconds.
+    """
+    kind, _, args = spec.partition(":")
+    vals = [float(x) for x in args.split(",") if x] if args else []
+    if kind == "fixed":
+        return lambda: vals[0]
+    if kind == "uniform":
+        return lambda: random.uniform(vals[0], vals[1])
+    if kind == "exp":
+        return lambda: random.expovariate(1.0 / vals[0])
+    if kind == "lognormal":
+        mu = math.log(vals[0])
+        return lambda: random.lognormvariate(mu, vals[1])
+    raise ValueError(f"unknown latency distribution: {spec}")
+
+
+class Profile:
+    """
+    Per-provider latency samplers and fault rates applied by the middleware.
+    """
+
+    def __init__(self, latency: Optional[str] = None, error_rate: float = 0.0,
+                 throttle_rate: float = 0.0, not_found_rate: float = 0.0,
+                 retry_after: float = 1.0):
+        self.default_latency = parse_latency(latency) if latency else None
+        self.latency: Dict[str, Callable[[], float]] = {}
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.not_found_rate = not_found_rate
+        self.retry_after = retry_after
+        self.served: Counter = Counter()    # (provider, status)
+
+    def set_latency(self, provider: str, spec: str):
+        self.latency[provider] = parse_latency(spec)
+
+    def delay(self, provider: str) -> float:
+        sampler = self.latency.get(provider) or self.default_latency
+        return max(0.0, sampler()) if sampler else LATENCY
+
+    def fault(self) -> Optional[int]:
+        r = random.random()
+        if r < self.error_rate:
+            return 500
+        r -= self.error_rate
+        if r < self.throttle_rate:
+            return 429
+        r -= self.throttle_rate
+        if r < self.not_found_rate:
+            return 404
+        return None
+
+
+PROFILE = Profile()
+PROFILE_KEY = web.AppKey("profile", Profile)
+
+
+@web.middleware
+async def emulate(request: web.Request, handler):
+    profile: Profile = request.app[PROFILE_KEY]
+    provider = request.path.strip("/").split("/", 1)[0]
+    delay = profile.delay(provider)
+    if delay:
+        await asyncio.sleep(delay)
+    status = profile.fault()
+    if status == 429:
+        resp = web.json_response({"message": "slow down"}, status=429,
+                                 headers={"Retry-After": f"{profile.retry_after:g}"})
+    elif status is not None:
+        resp = web.json_response({"message": "stub fault"}, status=status)
+    else:
+        resp = await handler(request)
+    profile.served[(provider, resp.status)] += 1
+    return resp
+
+
+routes = web.RouteTableDef()
+
+@routes.get("/github/users/{name}")
+async def github(request: web.Request):
+    name = request.match_info["name"]
+    return web.json_response({
+        "login": name, "name": name.title(), "avatar_url": f"https://a.local/{name}.png",
+        "bio": "stub", "followers": 1, "following": 1, "public_repos": 1,
+        "html_url": f"https://github.com/{name}", "email": None,
+    })
+
+@routes.get("/gitlab/api/v4/users")
+async def gitlab(request: web.Request):
+    name = request.query.get("username", "")
+    return web.json_response([{
+        "username": name, "name": name.title(), "web_url": f"https://gitlab.com/{name}",
+        "avatar_url": None,
+    }])
+
+@routes.get("/reddit/user/{name}/about.json")
+async def reddit(request: web.Request):
+    name = request.match_info["name"]
+    return web.json_response({"data": {
+        "name": name, "icon_img": None, "total_karma": 1,
+        "subreddit": {"title": name.title(), "public_description": "stub"},
+    }})
+
+@routes.get("/devto/api/users/by_username")
+async def devto(request: web.Request):
+    name = request.query.get("url", "")
+    return web.json_response({"username": name, "name": name.title(), "summary": "stub"})
+
+@routes.post("/github/graphql")
+async def github_graphql(request: web.Request):
+    # Aliased repositoryOwner(login: "...") lookups, as sent by providers.github_many;
+    # logins starting with "org" resolve as organizations
+    query = (await request.json()).get("query", "")
+    data = {}
+    for alias, login in re.findall(r'(\w+): repositoryOwner\(login: "([^"]+)"\)', query):
+        if login.startswith("missing"):
+            data[alias] = None
+        elif login.startswith("org"):
+            data[alias] = {"__typename": "Organization", "login": login, "name": login.title(),
+                           "avatarUrl": None, "repositories": {"totalCount": 1}}
+        else:
+            data[alias] = {
+                "__typename": "User", "login": login, "name": login.title(), "avatarUrl": None,
+                "bio": "stub", "followers": {"totalCount": 1}, "following": {"totalCount": 1},
+                "repositories": {"totalCount": 1},
+            }
+    return web.json_response({"data": data})
+
+@routes.get("/codeforces/api/user.info")
+async def codeforces(request: web.Request):
+    handles = [h for h in request.query.get("handles", "").split(";") if h]
+    missing = next((h for h in handles if h.startswith("missing")), None)
+    if missing:
+        # Like the real API: the whole call fails on the first unknown handle
+        return web.json_response({
+            "status": "FAILED", "comment": f"handles: User with handle {missing} not found",
+        }, status=400)
+    return web.json_response({
+        "status": "OK",
+        "result": [{"handle": h, "rating": 1500, "maxRating": 1600, "rank": "specialist"}
+                   for h in handles],
+    })
+
+@routes.get("/hackernews/v0/user/{name}.json")
+async def hackernews(request: web.Request):
+    return web.json_response({"id": request.match_info["name"], "about": "stub"})
+
+@routes.get("/stackoverflow/2.3/users")
+async def stackoverflow(request: web.Request):
+    name = request.query.get("inname", "")
+    return web.json_response({"items": [{
+        "display_name": name, "link": f"https://stackoverflow.com/users/1/{name}",
+        "profile_image": None,
+    }]})
+
+@routes.get("/bing/v7.0/search")
+async def bing(request: web.Request):
+    q = request.query.get("q", "")
+    offset = int(request.query.get("offset", "0") or 0)
+    count = int(request.query.get("count", "10") or 10)
+    name = q.split()[0] if q else "user"
+    sites = [t[5:] for t in q.split() if t.startswith("site:")] or ["example.com"]
+    return web.json_response({"webPages": {"value": [
+        {
+            "name": f"{name} on {site}",
+            "snippet": "stub",
+            # consecutive results differ only in tracking params (dedupe fodder)
+            "url": f"https://www.{site}/{name}/{(offset + i) // 2}?ref={(offset + i) % 3}",
+        }
+        for site in sites
+        for i in range(count)
+    ]}})
+
+def create_app(profile: Profile = PROFILE) -> web.Application:
+    app = web.Application(middlewares=[emulate])
+    app[PROFILE_KEY] = profile
+    app.add_routes(routes)
+    return app
+
+def start_in_thread(port: int, profile: Profile = PROFILE) -> threading.Event:
+    """
+    Serve the stand-in on 127.0.0.1:port from a daemon thread with its own loop.
+    Returns an event that is set once the server is accepting connections.
+    """
+    ready = threading.Event()
+
+    def _run():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        runner = web.AppRunner(create_app(profile), access_log=None)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+        ready.set()
+        loop.run_forever()
+
+    threading.Thread(target=_run, daemon=True).start()
+    ready.wait()
+    return ready
+
+def add_profile_args(ap: argparse.ArgumentParser):
+    ap.add_argument("--latency", action="append", default=[],
+                    help="distribution spec, or provider=spec; repeatable")
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--throttle-rate", type=float, default=0.0)
+    ap.add_argument("--not-found-rate", type=float, default=0.0)
+    ap.add_argument("--retry-after", type=float, default=1.0)
+
+def profile_from_args(args) -> Profile:
+    default = next((s for s in args.latency if "=" not in s), None)
+    profile = Profile(default, args.error_rate, args.throttle_rate,
+                      args.not_found_rate, args.retry_after)
+    for spec in args.latency:
+        if "=" in spec:
+            provider, _, dist = spec.partition("=")
+            profile.set_latency(provider, dist)
+    return profile
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--port", type=int, default=8081)
+    add_profile_args(ap)
+    args = ap.parse_args()
+    web.run_app(create_app(profile_from_args(args)), host="127.0.0.1", port=args.port,
+                access_log=None)
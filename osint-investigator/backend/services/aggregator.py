@@ -1,7 +1,8 @@
 import aiohttp
 import asyncio
-from typing import List, Dict, Any
-# Import provider modules and headers from providers.py 
+import time
+from typing import AsyncIterator, List, Dict, Any, Optional
+# Import provider modules and headers from providers.py
 
 from .providers import (
     github,
@@ -12,7 +13,13 @@ from .providers import (
     hackernews,
     stackoverflow,
     HEADERS_JSON,
+    PLATFORMS,
+    result_template,
 )
+from .breaker import ProviderUnavailable
+from .ratelimit import RateLimited
+from .metrics import METRICS
+from .singleflight import FLIGHTS, flight_key
 
 PROVIDERS = [
     github,
@@ -24,16 +31,92 @@ PROVIDERS = [
     stackoverflow,
 ]
 
-async def aggregate_results(username: str) -> List[Dict[str, Any]]:
-    async with aiohttp.ClientSession(headers=HEADERS_JSON) as session:
-        tasks = [prov(session, username) for prov in PROVIDERS]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+async def aggregate_results(username: str,
+                            session: Optional[aiohttp.ClientSession] = None,
+                            deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+    """
+    Run every provider for `username`. With a `deadline` (seconds), return at
+    that point with unfinished providers marked timed_out/pending; their shared
+    upstream calls keep running and land in the response cache.
+    """
+    # Reuse the caller's pooled session when given; otherwise open a one-off one.
+    if session is None:
+        async with aiohttp.ClientSession(headers=HEADERS_JSON) as own:
+            return await aggregate_results(username, own, deadline)
 
-    clean = []
-    for r in results:
-        if isinstance(r, Exception):
-            # Normalize any unexpected provider errors
-            clean.append({"platform": "unknown", "exists": False, "error": str(r)})
+    tasks = [asyncio.ensure_future(run_provider(prov, session, username)) for prov in PROVIDERS]
+    if deadline is None:
+        return list(await asyncio.gather(*tasks))
+
+    done, _ = await asyncio.wait(tasks, timeout=max(0.0, deadline))
+    results = []
+    for prov, task in zip(PROVIDERS, tasks):
+        if task in done:
+            results.append(task.result())
         else:
-            clean.append(r)
-    return clean
+            task.cancel()
+            results.append(timed_out_result(prov, deadline))
+    return results
+
+async def stream_results(username: str,
+                         session: aiohttp.ClientSession,
+                         deadline: Optional[float] = None) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Yield each provider's result as soon as it finishes (completion order).
+    Providers still running at `deadline` (seconds) are yielded as timed_out.
+    Providers still running are cancelled if the consumer stops early.
+    """
+    tasks = {asyncio.ensure_future(run_provider(prov, session, username)): prov
+             for prov in PROVIDERS}
+    loop = asyncio.get_running_loop()
+    ends_at = None if deadline is None else loop.time() + deadline
+    pending = set(tasks)
+    try:
+        while pending:
+            timeout = None if ends_at is None else max(0.0, ends_at - loop.time())
+            done, pending = await asyncio.wait(pending, timeout=timeout,
+                                               return_when=asyncio.FIRST_COMPLETED)
+            if not done:
+                break
+            for task in done:
+                yield task.result()
+        for task in pending:
+            yield timed_out_result(tasks[task], deadline)
+    finally:
+        for t in tasks:
+            t.cancel()
+
+def timed_out_result(prov, deadline: Optional[float]) -> Dict[str, Any]:
+    res = result_template(PLATFORMS.get(prov.__name__, "unknown"))
+    res.update({"timed_out": True, "pending": True,
+                "elapsed_ms": round((deadline or 0.0) * 1000, 1)})
+    return res
+
+async def run_provider(prov, session: aiohttp.ClientSession, username: str) -> Dict[str, Any]:
+    # Concurrent lookups of the same (provider, handle) share one upstream call
+    started = time.perf_counter()
+    res = await FLIGHTS.do(flight_key(prov.__name__, username),
+                           lambda: _call_provider(prov, session, username))
+    return {**res, "elapsed_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+async def _call_provider(prov, session: aiohttp.ClientSession, username: str) -> Dict[str, Any]:
+    name = prov.__name__
+    started = METRICS.started(name)
+    res = {"platform": PLATFORMS.get(name, "unknown"), "exists": False, "error": "cancelled"}
+    try:
+        res = await prov(session, username)
+    except RateLimited as e:
+        # Not a "does not exist": the upstream refused to answer in time
+        res = result_template(PLATFORMS.get(e.provider, "unknown"))
+        res.update({"rate_limited": True, "retry_after": e.retry_after, "error": str(e)})
+    except ProviderUnavailable as e:
+        # Breaker is open: fail fast instead of waiting out the timeout
+        res = result_template(PLATFORMS.get(e.provider, "unknown"))
+        res.update({"unavailable": True, "retry_in": round(e.retry_in, 1),
+                    "error": "provider unavailable"})
+    except Exception as e:
+        # Normalize any unexpected provider errors
+        res = {"platform": "unknown", "exists": False, "error": str(e)}
+    finally:
+        METRICS.finished(name, started, res)
+    return res
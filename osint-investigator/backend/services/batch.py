@@ -0,0 +1,180 @@
+import asyncio
+import time
+import uuid
+from collections import OrderedDict
+from typing import AsyncIterator, Dict, Any, List, Optional, Set
+
+import aiohttp
+
+from .aggregator import PROVIDERS, run_provider
+from .providers import BULK_BATCHERS
+
+JSON = Dict[str, Any]
+
+BATCH_CONCURRENCY = 32   # (username, provider) lookups in flight across all batches
+BATCH_WINDOW = 64        # lookups scheduled ahead per batch; bounds buffered results
+MAX_JOBS = 200           # finished/cancelled batches kept for progress and resume
+
+
+class BatchJob:
+    """
+    One batch of usernames, expanded into (username, provider) pairs.
+
+    Pairs are numbered 0..total-1 (username-major). Progress is tracked as a
+    cursor below which every pair is done, plus the few finished pairs above
+    it, so a cancelled batch can be resumed without redoing finished lookups.
+    """
+
+    def __init__(self, usernames: List[str]):
+        self.id = uuid.uuid4().hex
+        self.usernames = usernames
+        self.total = len(usernames) * len(PROVIDERS)
+        self.status = "pending"
+        self.created_at = time.time()
+        self.done = 0
+        self.found = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self._cursor = 0
+        self._done_ahead: Set[int] = set()
+        self._cancel = asyncio.Event()
+
+    def progress(self) -> JSON:
+        return {
+            "batch_id": self.id,
+            "status": self.status,
+            "usernames": len(self.usernames),
+            "total": self.total,
+            "done": self.done,
+            "found": self.found,
+            "errors": self.errors,
+            "rate_limited": self.rate_limited,
+            "remaining": self.total - self.done,
+        }
+
+    def cancel(self):
+        self._cancel.set()
+
+    def _pending_pairs(self):
+        for idx in range(self._cursor, self.total):
+            if idx not in self._done_ahead:
+                yield idx
+
+    def _mark_done(self, idx: int, record: JSON):
+        self.done += 1
+        if record.get("exists"):
+            self.found += 1
+        if record.get("rate_limited"):
+            self.rate_limited += 1
+        elif record.get("error"):
+            self.errors += 1
+        self._done_ahead.add(idx)
+        while self._cursor in self._done_ahead:
+            self._done_ahead.discard(self._cursor)
+            self._cursor += 1
+
+    async def run(self, session: aiohttp.ClientSession,
+                  limiter: asyncio.Semaphore) -> AsyncIterator[JSON]:
+        """
+        Yield one record per finished (username, provider) pair, in completion order.
+        Only pairs not already finished by an earlier run are looked up.
+        """
+        if self.status == "running":
+            raise RuntimeError("batch is already running")
+        self.status = "running"
+        self._cancel.clear()
+        n_prov = len(PROVIDERS)
+
+        # Bulk-capable providers are fetched a chunk of usernames per upstream
+        # call ahead of their single lookups, which then hit the response cache
+        bulk = {k: BULK_BATCHERS[p.__name__] for k, p in enumerate(PROVIDERS)
+                if p.__name__ in BULK_BATCHERS}
+        prefetches: Dict[tuple, asyncio.Task] = {}
+
+        async def prefetch(batcher, names: List[str]):
+            async with limiter:
+                try:
+                    await batcher.prefetch(session, names)
+                except Exception:
+                    pass  # the single lookups go upstream themselves
+
+        async def lookup(idx: int) -> JSON:
+            u, p = divmod(idx, n_prov)
+            username = self.usernames[u]
+            batcher = bulk.get(p)
+            if batcher is not None:
+                chunk = u // batcher.max_size
+                task = prefetches.get((p, chunk))
+                if task is None:
+                    names = self.usernames[chunk * batcher.max_size:(chunk + 1) * batcher.max_size]
+                    task = prefetches[(p, chunk)] = asyncio.ensure_future(prefetch(batcher, names))
+                await asyncio.shield(task)  # shared by the chunk; one cancelled lookup doesn't stop it
+            async with limiter:
+                rec = await run_provider(PROVIDERS[idx % n_prov], session, username)
+            return {"batch_id": self.id, "query": username, **rec}
+
+        pairs = self._pending_pairs()
+        pending: Dict[asyncio.Task, int] = {}
+        try:
+            while True:
+                while len(pending) < BATCH_WINDOW and not self._cancel.is_set():
+                    idx = next(pairs, None)
+                    if idx is None:
+                        break
+                    pending[asyncio.ensure_future(lookup(idx))] = idx
+                if not pending:
+                    break
+                finished, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    idx = pending.pop(task)
+                    rec = task.result()
+                    yield rec
+                    # Only once the consumer came back for more: a record lost
+                    # to a failed write stays pending and is redone on resume
+                    self._mark_done(idx, rec)
+            self.status = "cancelled" if self.done < self.total else "completed"
+        finally:
+            for task in list(pending) + list(prefetches.values()):
+                task.cancel()
+            if self.status == "running":
+                # Client went away or the generator was closed early
+                self.status = "cancelled"
+
+
+class BatchRegistry:
+    """
+    In-process registry of batches, evicting the oldest idle ones past MAX_JOBS.
+    """
+
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self.max_jobs = max_jobs
+        self._jobs: "OrderedDict[str, BatchJob]" = OrderedDict()
+
+    def create(self, usernames: List[str]) -> BatchJob:
+        job = BatchJob(usernames)
+        self._jobs[job.id] = job
+        self._evict()
+        return job
+
+    def get(self, batch_id: str) -> Optional[BatchJob]:
+        return self._jobs.get(batch_id)
+
+    def _evict(self):
+        idle = [k for k, j in self._jobs.items() if j.status != "running"]
+        while len(self._jobs) > self.max_jobs and idle:
+            self._jobs.pop(idle.pop(0), None)
+
+
+def parse_usernames(lines) -> List[str]:
+    """
+    Strip, drop blanks/comments and de-duplicate (case-insensitive), keeping order.
+    """
+    seen = set()
+    out = []
+    for line in lines:
+        u = str(line).strip()
+        if not u or u.startswith("#") or u.lower() in seen:
+            continue
+        seen.add(u.lower())
+        out.append(u)
+    return out
@@ -0,0 +1,108 @@
+import time
+from typing import Any, Dict, Optional
+
+FAILURE_THRESHOLD = 5     # consecutive timeouts/errors before a breaker opens
+OPEN_SECONDS = 30.0       # first cool-down before a probe is let through
+MAX_OPEN_SECONDS = 300.0  # cool-down doubles on each failed probe up to this
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+
+
+class ProviderUnavailable(Exception):
+    """
+    Raised instead of calling an upstream whose breaker is open.
+    """
+
+    def __init__(self, provider: Optional[str], retry_in: float):
+        super().__init__(f"{provider or 'upstream'} unavailable")
+        self.provider = provider
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    closed -> open after FAILURE_THRESHOLD consecutive failures; open -> half_open
+    once the cool-down passes, letting a single probe request through; the probe's
+    outcome closes the breaker or re-opens it with a doubled cool-down.
+    """
+
+    def __init__(self, threshold: int = FAILURE_THRESHOLD, open_seconds: float = OPEN_SECONDS):
+        self.threshold = threshold
+        self.base_open = open_seconds
+        self.open_for = open_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+        self.trips = 0
+
+    def retry_in(self) -> float:
+        if self.state == CLOSED:
+            return 0.0
+        return max(0.0, self.opened_at + self.open_for - time.monotonic())
+
+    def allow(self) -> bool:
+        if self.state == CLOSED:
+            return True
+        if self.state == OPEN and self.retry_in() <= 0:
+            self.state = HALF_OPEN
+            self.probing = False
+        if self.state == HALF_OPEN and not self.probing:
+            self.probing = True
+            return True
+        return False
+
+    def success(self):
+        self.state = CLOSED
+        self.failures = 0
+        self.probing = False
+        self.open_for = self.base_open
+
+    def failure(self):
+        self.failures += 1
+        if self.state == HALF_OPEN:
+            self.open_for = min(MAX_OPEN_SECONDS, self.open_for * 2)
+            self._open()
+        elif self.state == CLOSED and self.failures >= self.threshold:
+            self._open()
+
+    def release(self):
+        # A probe ended without an outcome (cancelled): let the next call probe
+        self.probing = False
+
+    def _open(self):
+        self.state = OPEN
+        self.opened_at = time.monotonic()
+        self.probing = False
+        self.trips += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "retry_in": round(self.retry_in(), 1),
+            "trips": self.trips,
+        }
+
+
+class BreakerRegistry:
+    def __init__(self):
+        self._breakers: Dict[str, CircuitBreaker] = {}
+
+    def get(self, provider: Optional[str]) -> CircuitBreaker:
+        key = provider or "unknown"
+        b = self._breakers.get(key)
+        if b is None:
+            b = self._breakers[key] = CircuitBreaker()
+        return b
+
+    def check(self, provider: Optional[str]):
+        b = self.get(provider)
+        if not b.allow():
+            raise ProviderUnavailable(provider, b.retry_in())
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        return {k: b.snapshot() for k, b in sorted(self._breakers.items())}
+
+
+BREAKERS = BreakerRegistry()
@@ -0,0 +1,195 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# (ttl, negative_ttl) in seconds per provider. Negative entries are "user does
+# not exist" answers: 404/410/400 or a 200 with an empty payload.
+PROVIDER_TTLS = {
+    "github": (6 * 3600, 15 * 60),
+    "gitlab": (6 * 3600, 15 * 60),
+    "reddit": (1 * 3600, 10 * 60),
+    "devto": (6 * 3600, 15 * 60),
+    "codeforces": (1 * 3600, 15 * 60),
+    "hackernews": (12 * 3600, 30 * 60),
+    "stackoverflow": (1 * 3600, 10 * 60),
+}
+DEFAULT_TTLS = (3600, 10 * 60)
+
+# Only definitive answers are cached; 429/5xx/timeouts always go upstream again.
+CACHEABLE_STATUSES = {200, 400, 404, 410}
+
+MEMORY_MAX_ENTRIES = 10_000
+DISK_PATH = os.getenv(
+    "OSINT_CACHE_DB",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), ".cache", "responses.sqlite3"),
+)
+
+Entry = Tuple[int, Any]  # (http status, parsed JSON body or None)
+
+
+def is_negative(status: int, data: Any) -> bool:
+    if status != 200 or not data:
+        return True
+    return isinstance(data, dict) and "items" in data and not data["items"]
+
+
+class _DiskTier:
+    """
+    SQLite-backed tier. Calls are blocking and meant to run via asyncio.to_thread.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if os.path.dirname(self.path):
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY, status INTEGER, body TEXT, expires REAL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str, now: float) -> Optional[Tuple[Entry, float]]:
+        with self._lock:
+            row = self._db().execute(
+                "SELECT status, body, expires FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None or row[2] <= now:
+            return None
+        return (row[0], json.loads(row[1])), row[2]
+
+    def put(self, key: str, entry: Entry, expires: float):
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "INSERT OR REPLACE INTO responses (key, status, body, expires) VALUES (?, ?, ?, ?)",
+                (key, entry[0], json.dumps(entry[1]), expires),
+            )
+            db.commit()
+
+    def purge_expired(self, now: float) -> int:
+        with self._lock:
+            db = self._db()
+            n = db.execute("DELETE FROM responses WHERE expires <= ?", (now,)).rowcount
+            db.commit()
+        return n
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class ResponseCache:
+    """
+    Two-tier (memory LRU -> SQLite) cache of upstream JSON responses keyed by URL.
+    Disk hits are promoted into memory with their remaining TTL.
+    """
+
+    def __init__(self, disk_path: Optional[str] = DISK_PATH,
+                 max_entries: int = MEMORY_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._mem: "OrderedDict[str, Tuple[Entry, float]]" = OrderedDict()
+        self._disk = _DiskTier(disk_path) if disk_path else None
+        self.stats: Dict[str, int] = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "negative_hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "negative_stores": 0,
+            "evictions": 0,
+        }
+
+    def _remember(self, key: str, entry: Entry, expires: float):
+        self._mem[key] = (entry, expires)
+        self._mem.move_to_end(key)
+        while len(self._mem) > self.max_entries:
+            self._mem.popitem(last=False)
+            self.stats["evictions"] += 1
+
+    async def get(self, key: str) -> Optional[Entry]:
+        now = time.time()
+        hit = self._mem.get(key)
+        if hit is not None:
+            if hit[1] > now:
+                self._mem.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                if is_negative(*hit[0]):
+                    self.stats["negative_hits"] += 1
+                return hit[0]
+            del self._mem[key]
+
+        if self._disk is not None:
+            try:
+                found = await asyncio.to_thread(self._disk.get, key, now)
+            except sqlite3.Error:
+                found = None
+            if found is not None:
+                entry, expires = found
+                self._remember(key, entry, expires)
+                self.stats["disk_hits"] += 1
+                if is_negative(*entry):
+                    self.stats["negative_hits"] += 1
+                return entry
+
+        self.stats["misses"] += 1
+        return None
+
+    async def put(self, provider: Optional[str], key: str, status: int, data: Any):
+        if status not in CACHEABLE_STATUSES:
+            return
+        ttl, negative_ttl = PROVIDER_TTLS.get(provider, DEFAULT_TTLS)
+        negative = is_negative(status, data)
+        expires = time.time() + (negative_ttl if negative else ttl)
+        entry = (status, data)
+        self._remember(key, entry, expires)
+        self.stats["stores"] += 1
+        if negative:
+            self.stats["negative_stores"] += 1
+        if self._disk is not None:
+            try:
+                await asyncio.to_thread(self._disk.put, key, entry, expires)
+            except sqlite3.Error:
+                pass
+
+    def snapshot(self) -> Dict[str, Any]:
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        lookups = hits + self.stats["misses"]
+        return {
+            **self.stats,
+            "memory_entries": len(self._mem),
+            "hit_ratio": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+    async def purge_expired(self) -> int:
+        now = time.time()
+        for key in [k for k, (_, exp) in self._mem.items() if exp <= now]:
+            del self._mem[key]
+        if self._disk is None:
+            return 0
+        return await asyncio.to_thread(self._disk.purge_expired, now)
+
+    def clear_memory(self):
+        self._mem.clear()
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+
+
+RESPONSE_CACHE = ResponseCache()
@@ -0,0 +1,75 @@
+import asyncio
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+WINDOW = 200            # recent upstream latencies kept per provider
+MIN_SAMPLES = 20        # no hedging until a provider has this much history
+MIN_HEDGE_DELAY = 0.05  # seconds; never hedge sooner than this
+MAX_HEDGE_RATIO = 0.10  # at most this share of requests may be hedged
+
+
+class Hedger:
+    """
+    Tail-latency hedging: if an upstream call runs past the provider's recent
+    p95, issue one duplicate and take whichever answers first.
+    """
+
+    def __init__(self):
+        self._latencies: Dict[str, Deque[float]] = {}
+        self.stats: Dict[str, int] = {"requests": 0, "hedged": 0, "hedge_wins": 0}
+
+    def record(self, provider: str, seconds: float):
+        window = self._latencies.get(provider)
+        if window is None:
+            window = self._latencies[provider] = deque(maxlen=WINDOW)
+        window.append(seconds)
+
+    def p95(self, provider: str) -> Optional[float]:
+        window = self._latencies.get(provider)
+        if not window or len(window) < MIN_SAMPLES:
+            return None
+        ordered = sorted(window)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+    def hedge_delay(self, provider: str) -> Optional[float]:
+        if self.stats["hedged"] >= MAX_HEDGE_RATIO * max(1, self.stats["requests"]):
+            return None
+        p95 = self.p95(provider)
+        return None if p95 is None else max(MIN_HEDGE_DELAY, p95)
+
+    async def run(self, provider: str, attempt: Callable[[], Awaitable[T]]) -> T:
+        self.stats["requests"] += 1
+        delay = self.hedge_delay(provider)
+        first = asyncio.ensure_future(attempt())
+        if delay is None:
+            return await first
+
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                self.stats["hedged"] += 1
+                tasks.add(asyncio.ensure_future(attempt()))
+            while True:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    tasks.discard(task)
+                    if task.exception() is None or not tasks:
+                        if task is not first:
+                            self.stats["hedge_wins"] += 1
+                        return task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "p95_ms": {k: round(v * 1000, 1) for k in self._latencies
+                       if (v := self.p95(k)) is not None},
+        }
+
+
+HEDGER = Hedger()
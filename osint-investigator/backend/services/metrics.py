@@ -0,0 +1,141 @@
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Mapping, Tuple
+
+# Latency histogram bucket bounds in seconds (+Inf is implicit)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0)
+
+
+def outcome(result: Mapping[str, Any]) -> str:
+    if result.get("rate_limited"):
+        return "rate_limited"
+    if result.get("unavailable"):
+        return "unavailable"
+    if result.get("timed_out"):
+        return "timed_out"
+    if result.get("error"):
+        return "error"
+    return "found" if result.get("exists") else "not_found"
+
+
+def _labels(**kv) -> str:
+    return "{" + ",".join(f'{k}="{v}"' for k, v in kv.items()) + "}"
+
+
+class ProviderMetrics:
+    """
+    In-process per-provider instrumentation rendered in Prometheus text format.
+
+    Provider-level numbers (latency, in-flight, outcome) are recorded around
+    each provider call; upstream-level numbers (HTTP status, timeouts, parse
+    errors, throttling) are recorded by fetch_json per HTTP attempt.
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._hist: Dict[str, List[int]] = defaultdict(lambda: [0] * (len(self.buckets) + 1))
+        self._hist_sum: Dict[str, float] = defaultdict(float)
+        self.inflight: Dict[str, int] = defaultdict(int)
+        self.outcomes: Counter = Counter()       # (provider, outcome)
+        self.responses: Counter = Counter()      # (provider, status)
+        self.timeouts: Counter = Counter()
+        self.parse_errors: Counter = Counter()
+        self.rate_limited: Counter = Counter()
+        self.transport_errors: Counter = Counter()
+
+    # -- provider calls --
+
+    def started(self, provider: str) -> float:
+        self.inflight[provider] += 1
+        return time.perf_counter()
+
+    def finished(self, provider: str, started: float, result: Mapping[str, Any]) -> float:
+        elapsed = time.perf_counter() - started
+        self.inflight[provider] -= 1
+        counts = self._hist[provider]
+        for i, bound in enumerate(self.buckets):
+            if elapsed <= bound:
+                counts[i] += 1
+                break
+        else:
+            counts[-1] += 1
+        self._hist_sum[provider] += elapsed
+        self.outcomes[(provider, outcome(result))] += 1
+        return elapsed
+
+    # -- upstream HTTP attempts --
+
+    def response(self, provider: str, status: int):
+        self.responses[(provider, status)] += 1
+
+    def timeout(self, provider: str):
+        self.timeouts[provider] += 1
+
+    def parse_error(self, provider: str):
+        self.parse_errors[provider] += 1
+
+    def throttled(self, provider: str):
+        self.rate_limited[provider] += 1
+
+    def transport_error(self, provider: str):
+        self.transport_errors[provider] += 1
+
+    # -- exposition --
+
+    def render(self) -> str:
+        out: List[str] = []
+
+        out.append("# HELP osint_provider_duration_seconds Provider call latency.")
+        out.append("# TYPE osint_provider_duration_seconds histogram")
+        for provider in sorted(self._hist):
+            counts = self._hist[provider]
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float("inf"),), counts):
+                cumulative += n
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                out.append(f"osint_provider_duration_seconds_bucket{_labels(provider=provider, le=le)} {cumulative}")
+            out.append(f"osint_provider_duration_seconds_sum{_labels(provider=provider)} {self._hist_sum[provider]:.6f}")
+            out.append(f"osint_provider_duration_seconds_count{_labels(provider=provider)} {cumulative}")
+
+        out.append("# HELP osint_provider_inflight Provider calls currently in flight.")
+        out.append("# TYPE osint_provider_inflight gauge")
+        for provider in sorted(self.inflight):
+            out.append(f"osint_provider_inflight{_labels(provider=provider)} {self.inflight[provider]}")
+
+        out.append("# HELP osint_provider_results_total Provider call outcomes.")
+        out.append("# TYPE osint_provider_results_total counter")
+        for (provider, result), n in sorted(self.outcomes.items()):
+            out.append(f"osint_provider_results_total{_labels(provider=provider, outcome=result)} {n}")
+
+        out.append("# HELP osint_upstream_responses_total Upstream HTTP responses by status code.")
+        out.append("# TYPE osint_upstream_responses_total counter")
+        for (provider, status), n in sorted(self.responses.items()):
+            out.append(f"osint_upstream_responses_total{_labels(provider=provider, status=status)} {n}")
+
+        for name, help_text, counter in (
+            ("osint_upstream_timeouts_total", "Upstream requests that timed out.", self.timeouts),
+            ("osint_upstream_parse_errors_total", "Upstream bodies that were not valid JSON.", self.parse_errors),
+            ("osint_upstream_rate_limited_total", "Upstream responses that signalled throttling.", self.rate_limited),
+            ("osint_upstream_errors_total", "Upstream connection/transport errors.", self.transport_errors),
+        ):
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} counter")
+            for provider, n in sorted(counter.items()):
+                out.append(f"{name}{_labels(provider=provider)} {n}")
+
+        return "\n".join(out) + "\n"
+
+
+def render_stats(prefix: str, stats: Mapping[str, Any]) -> str:
+    """
+    Flat numeric stats dict (cache, single-flight, ...) as untyped samples.
+    """
+    lines = []
+    for key, value in stats.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            lines.append(f"# TYPE {prefix}_{key} untyped")
+            lines.append(f"{prefix}_{key} {value}")
+    return "\n".join(lines) + "\n" if lines else ""
+
+
+METRICS = ProviderMetrics()
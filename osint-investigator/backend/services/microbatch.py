@@ -0,0 +1,108 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Tuple
+
+import aiohttp
+
+from .cache import RESPONSE_CACHE
+
+# How long a lookup waits for others to join its upstream call (seconds).
+# Lookups issued in the same loop iteration are always grouped, even at 0, so
+# interactive searches add no wait by default; batches prefetch in bulk instead
+# (BatchJob, MicroBatcher.prefetch).
+WINDOW = float(os.getenv("OSINT_MICROBATCH_WINDOW", "0"))
+
+FetchMany = Callable[[aiohttp.ClientSession, List[str]], Awaitable[Dict[str, Any]]]
+Group = Tuple[asyncio.AbstractEventLoop, aiohttp.ClientSession]
+
+
+class MicroBatcher:
+    """
+    Collect individual lookups for a short window and resolve them with one
+    provider batch call. `fetch_many(session, keys)` returns {key: data or None};
+    keys are normalized with `key()` (case-insensitive by default).
+
+    Lookups are grouped per (event loop, session): a batch only ever holds
+    callers of one loop and is fetched with their own session.
+    """
+
+    def __init__(self, fetch_many: FetchMany, max_size: int, window: float = WINDOW,
+                 key: Callable[[str], str] = lambda s: s.strip().lower()):
+        self.fetch_many = fetch_many
+        self.max_size = max_size
+        self.window = window
+        self.key = key
+        self._pending: Dict[Group, Dict[str, List[asyncio.Future]]] = {}
+        self._timers: Dict[Group, asyncio.TimerHandle] = {}
+        self.stats: Dict[str, int] = {"lookups": 0, "upstream_batches": 0, "largest_batch": 0,
+                                      "prefetched": 0}
+
+    async def load(self, session: aiohttp.ClientSession, item: str) -> Any:
+        loop = asyncio.get_running_loop()
+        group = (loop, session)
+        key = self.key(item)
+        fut = loop.create_future()
+        self.stats["lookups"] += 1
+        pending = self._pending.setdefault(group, {})
+        pending.setdefault(key, []).append(fut)
+        if len(pending) >= self.max_size:
+            self._flush(group)
+        elif group not in self._timers:
+            self._timers[group] = loop.call_later(self.window, self._flush, group)
+        return await fut
+
+    async def prefetch(self, session: aiohttp.ClientSession, items: List[str]):
+        """
+        Resolve many items in bulk up front; fetch_many caches each answer per
+        item, so the load() calls that follow are served without going upstream.
+        """
+        self.stats["prefetched"] += len(items)
+        await self.fetch_many(session, [self.key(i) for i in items])
+
+    def _flush(self, group: Group):
+        timer = self._timers.pop(group, None)
+        if timer is not None:
+            timer.cancel()
+        batch = self._pending.pop(group, None)
+        if not batch:
+            return
+        self.stats["upstream_batches"] += 1
+        self.stats["largest_batch"] = max(self.stats["largest_batch"], len(batch))
+        loop, session = group
+        loop.create_task(self._run(session, batch))
+
+    async def _run(self, session: aiohttp.ClientSession, batch: Dict[str, List[asyncio.Future]]):
+        try:
+            found = await self.fetch_many(session, list(batch))
+        except Exception as e:
+            for futs in batch.values():
+                for f in futs:
+                    if not f.done():
+                        f.set_exception(e)
+            return
+        for key, futs in batch.items():
+            for f in futs:
+                if not f.done():
+                    f.set_result(found.get(key))
+
+
+def chunks(items: List[str], size: int) -> List[List[str]]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+async def split_cached(keys: List[str], url_for: Callable[[str], str],
+                       unwrap: Callable[[Any], Any]) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Answer what the response cache already knows under the single-user URLs.
+    Returns ({key: data or None} for cached keys, keys still to fetch).
+    """
+    out: Dict[str, Any] = {}
+    todo: List[str] = []
+    for k in keys:
+        cached = await RESPONSE_CACHE.get(url_for(k))
+        if cached is None:
+            todo.append(k)
+        else:
+            status, data = cached
+            out[k] = unwrap(data) if status == 200 else None
+    return out, todo
@@ -1,23 +1,169 @@
+import asyncio
+import json
+import os
+import re
+import time
 import aiohttp
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, Optional, Tuple
+
+from .breaker import BREAKERS
+from .cache import RESPONSE_CACHE
+from .hedging import HEDGER
+from .metrics import METRICS
+from .microbatch import MicroBatcher, chunks, split_cached
+from .ratelimit import (
+    MAX_ATTEMPTS,
+    RETRY_DEADLINE,
+    SCHEDULER,
+    RateLimited,
+    backoff,
+)
 
 JSON = Dict[str, Any]
 
 DEFAULT_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
+# Upstream API roots. Setting OSINT_UPSTREAM_BASE points every provider at a
+# local stand-in (e.g. http://127.0.0.1:8081 -> http://127.0.0.1:8081/github).
+BASE_URLS = {
+    "github": "https://api.github.com",
+    "gitlab": "https://gitlab.com",
+    "reddit": "https://www.reddit.com",
+    "devto": "https://dev.to",
+    "codeforces": "https://codeforces.com",
+    "hackernews": "https://hacker-news.firebaseio.com",
+    "stackoverflow": "https://api.stackexchange.com",
+}
+
+_UPSTREAM_BASE = os.getenv("OSINT_UPSTREAM_BASE")
+if _UPSTREAM_BASE:
+    BASE_URLS = {k: f"{_UPSTREAM_BASE.rstrip('/')}/{k}" for k in BASE_URLS}
+
 HEADERS_JSON = {
     "Accept": "application/json",
     "User-Agent": "osint-investigator/1.0 (+https://example.local)"
 }
 
-async def fetch_json(session: aiohttp.ClientSession, url: str) -> Optional[JSON]:
-    try:
-        async with session.get(url, timeout=DEFAULT_TIMEOUT) as resp:
-            if resp.status != 200:
-                return None
-            return await resp.json(content_type=None)
-    except Exception:
+# Optional: enables GitHub GraphQL batch lookups and the authenticated REST quota
+GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+GITHUB_HEADERS = {"Authorization": f"bearer {GITHUB_TOKEN}"} if GITHUB_TOKEN else None
+
+CODEFORCES_MAX_BATCH = 100    # handles per user.info call
+GITHUB_MAX_BATCH = 50         # aliased user() lookups per GraphQL query
+
+async def fetch_json(session: aiohttp.ClientSession, url: str,
+                     provider: Optional[str] = None,
+                     headers: Optional[Dict[str, str]] = None) -> Optional[JSON]:
+    # Served from the response cache when possible; `provider` picks the TTLs
+    cached = await RESPONSE_CACHE.get(url)
+    if cached is not None:
+        status, data = cached
+        return data if status == 200 else None
+
+    status, data = await request_json(session, url, provider, headers)
+    if status == 0:
         return None
+    if status != 200:
+        data = None
+    await RESPONSE_CACHE.put(provider, url, status, data)
+    return data
+
+async def request_json(session: aiohttp.ClientSession, url: str,
+                       provider: Optional[str] = None,
+                       headers: Optional[Dict[str, str]] = None,
+                       method: str = "GET",
+                       json_body: Any = None) -> Tuple[int, Any]:
+    """
+    Uncached upstream call returning (status, parsed body).
+    Status 0 means no usable response (timeout, transport or parse error).
+    Bodies are parsed for 200 and for the 4xx codes that carry error details.
+    Raises ProviderUnavailable without calling out while the breaker is open.
+    """
+    BREAKERS.check(provider)
+    breaker = BREAKERS.get(provider)
+    label = provider or "unknown"
+
+    async def attempt() -> Tuple[int, Any]:
+        started = time.perf_counter()
+        res = await _request_json(session, url, provider, headers, method, json_body)
+        if res[0]:
+            HEDGER.record(label, time.perf_counter() - started)
+        return res
+
+    try:
+        # A call running past the provider's recent p95 gets one hedged duplicate
+        status, data = await HEDGER.run(label, attempt)
+    except RateLimited:
+        breaker.success()   # throttled, but the upstream is up
+        raise
+    except BaseException:
+        breaker.release()
+        raise
+    if status == 0 or status >= 500:
+        breaker.failure()
+    else:
+        breaker.success()
+    return status, data
+
+async def _request_json(session: aiohttp.ClientSession, url: str, provider: Optional[str],
+                        headers: Optional[Dict[str, str]], method: str,
+                        json_body: Any) -> Tuple[int, Any]:
+    # Paced by the provider's token bucket; throttled/5xx responses are retried
+    # until RETRY_DEADLINE, then surface as RateLimited rather than "not found".
+    deadline = time.monotonic() + RETRY_DEADLINE
+    label = provider or "unknown"
+    status, data = 0, None
+    for attempt in range(MAX_ATTEMPTS):
+        if not await SCHEDULER.acquire(provider, deadline):
+            SCHEDULER.stats["gave_up"] += 1
+            raise RateLimited(provider)
+        try:
+            async with session.request(method, url, headers=headers, json=json_body,
+                                       timeout=DEFAULT_TIMEOUT) as resp:
+                status = resp.status
+                METRICS.response(label, status)
+                data = None
+                if status in (200, 400, 403, 429):
+                    try:
+                        data = await resp.json(content_type=None)
+                    except ValueError:
+                        if status == 200:
+                            METRICS.parse_error(label)
+                            return 0, None
+                throttled = SCHEDULER.observe(provider, status, resp.headers, data)
+        except asyncio.TimeoutError:
+            METRICS.timeout(label)
+            return 0, None
+        except Exception:
+            METRICS.transport_error(label)
+            return 0, None
+
+        if throttled is not None:
+            METRICS.throttled(label)
+            if time.monotonic() + throttled > deadline or attempt == MAX_ATTEMPTS - 1:
+                SCHEDULER.stats["gave_up"] += 1
+                raise RateLimited(provider, throttled)
+            SCHEDULER.stats["retries"] += 1
+            continue
+        if status >= 500 and attempt < MAX_ATTEMPTS - 1:
+            delay = backoff(attempt)
+            if time.monotonic() + delay < deadline:
+                SCHEDULER.stats["retries"] += 1
+                await asyncio.sleep(delay)
+                continue
+        break
+    return status, data
+
+# Provider key -> platform label used in results
+PLATFORMS = {
+    "github": "GitHub",
+    "gitlab": "GitLab",
+    "reddit": "Reddit",
+    "devto": "Dev.to",
+    "codeforces": "Codeforces",
+    "hackernews": "HackerNews",
+    "stackoverflow": "StackOverflow",
+}
 
 def result_template(platform: str) -> JSON:
     return {
@@ -30,12 +176,130 @@ def result_template(platform: str) -> JSON:
         "bio": None,
     }
 
+# ---------- Batch lookups (one upstream call for many handles) ----------
+
+def github_url(login: str) -> str:
+    return f"{BASE_URLS['github']}/users/{login}"
+
+def codeforces_url(handle: str) -> str:
+    return f"{BASE_URLS['codeforces']}/api/user.info?handles={handle}"
+
+GITHUB_LOGIN = re.compile(r"^[A-Za-z0-9](?:[A-Za-z0-9-]{0,38})$")
+CODEFORCES_HANDLE = re.compile(r"^[A-Za-z0-9_.-]{1,24}$")
+
+# repositoryOwner resolves users and organizations alike, as REST /users/<login> does
+_GQL_OWNER = (
+    "__typename login avatarUrl "
+    "repositories(privacy: PUBLIC) { totalCount } "
+    "... on User { name bio followers { totalCount } following { totalCount } } "
+    "... on Organization { name }"
+)
+
+def _github_rest_shape(u: JSON) -> JSON:
+    # GraphQL owner -> the subset of the REST /users/<login> body github() reads
+    return {
+        "login": u.get("login"),
+        "type": u.get("__typename"),
+        "name": u.get("name"),
+        "avatar_url": u.get("avatarUrl"),
+        "bio": u.get("bio"),
+        "followers": (u.get("followers") or {}).get("totalCount"),
+        "following": (u.get("following") or {}).get("totalCount"),
+        "public_repos": (u.get("repositories") or {}).get("totalCount"),
+    }
+
+async def github_many(session: aiohttp.ClientSession, logins: Iterable[str]) -> Dict[str, Optional[JSON]]:
+    """
+    Resolve many GitHub logins (users and organizations) with aliased GraphQL
+    repositoryOwner() queries (needs GITHUB_TOKEN).
+    Returns {lower-cased login: REST-shaped user or None}. Results are cached per
+    login under the REST URL, so single lookups share them.
+    """
+    keys = [l.lower() for l in logins]
+    out, todo = await split_cached(keys, github_url,
+                                   lambda d: d if d and "login" in d else None)
+    for k in [k for k in todo if not GITHUB_LOGIN.match(k)]:
+        out[k] = None
+    todo = [k for k in todo if k not in out]
+
+    for chunk in chunks(todo, GITHUB_MAX_BATCH):
+        fields = " ".join(f"u{i}: repositoryOwner(login: {json.dumps(k)}) {{ {_GQL_OWNER} }}"
+                          for i, k in enumerate(chunk))
+        status, data = await request_json(
+            session, f"{BASE_URLS['github']}/graphql", "github",
+            headers=GITHUB_HEADERS, method="POST", json_body={"query": f"query {{ {fields} }}"},
+        )
+        users = (data or {}).get("data") if status == 200 and isinstance(data, dict) else None
+        if users is None:
+            # Transient failure: answer None without caching
+            out.update({k: None for k in chunk})
+            continue
+        for i, k in enumerate(chunk):
+            u = users.get(f"u{i}")
+            if u:
+                out[k] = _github_rest_shape(u)
+                await RESPONSE_CACHE.put("github", github_url(k), 200, out[k])
+            else:
+                out[k] = None
+                await RESPONSE_CACHE.put("github", github_url(k), 404, None)
+    return out
+
+async def codeforces_many(session: aiohttp.ClientSession, handles: Iterable[str]) -> Dict[str, Optional[JSON]]:
+    """
+    Resolve many Codeforces handles with user.info?handles=a;b;c.
+    Returns {lower-cased handle: user or None}. The API fails the whole call
+    when one handle is unknown, so that handle is dropped and the rest retried.
+    """
+    keys = [h.lower() for h in handles]
+    out, todo = await split_cached(
+        keys, codeforces_url,
+        lambda d: (d.get("result") or [None])[0] if d and d.get("status") == "OK" else None,
+    )
+    for k in [k for k in todo if not CODEFORCES_HANDLE.match(k)]:
+        out[k] = None
+    todo = [k for k in todo if k not in out]
+
+    for chunk in chunks(todo, CODEFORCES_MAX_BATCH):
+        while chunk:
+            status, data = await request_json(
+                session, codeforces_url(";".join(chunk)), "codeforces")
+            if status == 200 and isinstance(data, dict) and data.get("status") == "OK":
+                # user.info answers in request order
+                for k, u in zip(chunk, data.get("result") or []):
+                    out[k] = u
+                    await RESPONSE_CACHE.put("codeforces", codeforces_url(k), 200,
+                                             {"status": "OK", "result": [u]})
+                break
+            missing = None
+            if status == 400 and isinstance(data, dict):
+                # "handles: User with handle <h> not found"
+                m = re.search(r"handle (\S+) not found", str(data.get("comment", "")))
+                missing = m.group(1).lower() if m else None
+            if missing not in chunk:
+                out.update({k: None for k in chunk})
+                break
+            out[missing] = None
+            await RESPONSE_CACHE.put("codeforces", codeforces_url(missing), 400, None)
+            chunk = [k for k in chunk if k != missing]
+    return out
+
+GITHUB_BATCHER = MicroBatcher(github_many, max_size=GITHUB_MAX_BATCH)
+CODEFORCES_BATCHER = MicroBatcher(codeforces_many, max_size=CODEFORCES_MAX_BATCH)
+
+# Providers that resolve lookups through a batcher, by provider name; BatchJob
+# prefetches these in bulk per chunk of usernames.
+BULK_BATCHERS = {"codeforces": CODEFORCES_BATCHER}
+if GITHUB_TOKEN:
+    BULK_BATCHERS["github"] = GITHUB_BATCHER
+
 # ---------- Providers (public/official endpoints only) ----------
 
 async def github(session: aiohttp.ClientSession, username: str) -> JSON:
     res = result_template("GitHub")
-    url = f"https://api.github.com/users/{username}"
-    data = await fetch_json(session, url)
+    if GITHUB_TOKEN:
+        data = await GITHUB_BATCHER.load(session, username)
+    else:
+        data = await fetch_json(session, github_url(username), "github")
     if not data or "login" not in data:
         return res
     res.update({
@@ -55,8 +319,8 @@ async def github(session: aiohttp.ClientSession, username: str) -> JSON:
 
 async def gitlab(session: aiohttp.ClientSession, username: str) -> JSON:
     res = result_template("GitLab")
-    url = f"https://gitlab.com/api/v4/users?username={username}"
-    data = await fetch_json(session, url)
+    url = f"{BASE_URLS['gitlab']}/api/v4/users?username={username}"
+    data = await fetch_json(session, url, "gitlab")
     if not data or not isinstance(data, list) or len(data) == 0:
         return res
     u = data[0]
@@ -73,17 +337,13 @@ async def gitlab(session: aiohttp.ClientSession, username: str) -> JSON:
 async def reddit(session: aiohttp.ClientSession, username: str) -> JSON:
     # Reddit public user about endpoint (no auth for public profiles)
     res = result_template("Reddit")
-    url = f"https://www.reddit.com/user/{username}/about.json"
+    url = f"{BASE_URLS['reddit']}/user/{username}/about.json"
     # Reddit is picky about UA header
-    try:
-        async with session.get(url, headers={
-            **HEADERS_JSON,
-            "User-Agent": "osint-investigator/1.0 (contact: demo@app)"
-        }, timeout=DEFAULT_TIMEOUT) as resp:
-            if resp.status != 200:
-                return res
-            data = await resp.json(content_type=None)
-    except Exception:
+    data = await fetch_json(session, url, "reddit", headers={
+        **HEADERS_JSON,
+        "User-Agent": "osint-investigator/1.0 (contact: demo@app)"
+    })
+    if data is None:
         return res
 
     d = (data or {}).get("data") or {}
@@ -102,8 +362,8 @@ async def reddit(session: aiohttp.ClientSession, username: str) -> JSON:
 
 async def devto(session: aiohttp.ClientSession, username: str) -> JSON:
     res = result_template("Dev.to")
-    url = f"https://dev.to/api/users/by_username?url={username}"
-    data = await fetch_json(session, url)
+    url = f"{BASE_URLS['devto']}/api/users/by_username?url={username}"
+    data = await fetch_json(session, url, "devto")
     if not data or "username" not in data:
         return res
     res.update({
@@ -118,14 +378,9 @@ async def devto(session: aiohttp.ClientSession, username: str) -> JSON:
 
 async def codeforces(session: aiohttp.ClientSession, username: str) -> JSON:
     res = result_template("Codeforces")
-    url = f"https://codeforces.com/api/user.info?handles={username}"
-    data = await fetch_json(session, url)
-    if not data or data.get("status") != "OK":
-        return res
-    items = data.get("result") or []
-    if not items:
+    u = await CODEFORCES_BATCHER.load(session, username)
+    if not u:
         return res
-    u = items[0]
     res.update({
         "exists": True,
         "username": u.get("handle"),
@@ -138,8 +393,8 @@ async def codeforces(session: aiohttp.ClientSession, username: str) -> JSON:
 
 async def hackernews(session: aiohttp.ClientSession, username: str) -> JSON:
     res = result_template("HackerNews")
-    url = f"https://hacker-news.firebaseio.com/v0/user/{username}.json"
-    data = await fetch_json(session, url)
+    url = f"{BASE_URLS['hackernews']}/v0/user/{username}.json"
+    data = await fetch_json(session, url, "hackernews")
     if not data:
         return res
     res.update({
@@ -159,9 +414,9 @@ async def stackoverflow(session: aiohttp.ClientSession, username: str) -> JSON:
     """
     res = result_template("StackOverflow")
     # Note: rate-limited; for heavier use, register an API key.
-    url = ("https://api.stackexchange.com/2.3/users"
+    url = (f"{BASE_URLS['stackoverflow']}/2.3/users"
            f"?order=desc&sort=reputation&inname={username}&site=stackoverflow")
-    data = await fetch_json(session, url)
+    data = await fetch_json(session, url, "stackoverflow")
     if not data or not data.get("items"):
         return res
     item = data["items"][0]
@@ -0,0 +1,231 @@
+import asyncio
+import os
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional, Tuple
+
+# (requests per second, burst) per provider, i.e. per upstream host.
+# These are ceilings; GitHub/Reddit rate-limit headers lower them at runtime.
+RATE_LIMITS = {
+    "github": (1.0, 10),
+    "gitlab": (5.0, 10),
+    "reddit": (0.5, 5),
+    "devto": (2.0, 5),
+    "codeforces": (0.5, 2),      # documented: one call per 2 seconds
+    "hackernews": (20.0, 40),
+    "stackoverflow": (5.0, 10),
+}
+DEFAULT_RATE_LIMIT = (2.0, 5)
+MIN_RATE = 0.01
+
+# Set OSINT_RATE_LIMIT=0 to skip the token buckets (e.g. against a local stand-in).
+# Upstream 429/Retry-After handling stays active either way.
+ENABLED = os.getenv("OSINT_RATE_LIMIT", "1") != "0"
+
+RETRY_DEADLINE = 20.0   # seconds a single fetch may spend waiting and retrying
+MAX_ATTEMPTS = 4
+BACKOFF_BASE = 0.5      # seconds, doubled per attempt for 5xx
+JITTER = 0.25           # fraction of a server-requested delay added at random...
+MAX_JITTER = 2.0        # ...but never more than this many seconds past it
+
+
+class RateLimited(Exception):
+    """
+    Raised when an upstream keeps rate-limiting us past the retry deadline.
+    """
+
+    def __init__(self, provider: Optional[str], retry_after: Optional[float] = None):
+        super().__init__(f"{provider or 'upstream'} rate limited")
+        self.provider = provider
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float):
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self, deadline: float) -> bool:
+        """
+        Take one token, waiting if needed. False if it can't be had before `deadline`.
+        """
+        while True:
+            now = time.monotonic()
+            self._refill(now)
+            if self.paused_until > now:
+                wait = self.paused_until - now
+            elif self.tokens >= 1.0:
+                self.tokens -= 1.0
+                return True
+            else:
+                wait = (1.0 - self.tokens) / self.rate
+            if now + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        now = time.monotonic()
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0.0
+        self.updated = now
+
+    def adapt(self, remaining: float, reset_in: float):
+        # Spread what is left of the upstream window evenly over its remaining time
+        if reset_in <= 0:
+            return
+        if remaining <= 0:
+            self.pause(reset_in)
+            self.rate = self.base_rate
+        else:
+            self.rate = max(MIN_RATE, min(self.base_rate, remaining / reset_in))
+
+
+def _header_float(headers: Mapping[str, str], name: str) -> Optional[float]:
+    try:
+        return float(headers[name])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+def _seconds_until(value: Optional[float]) -> Optional[float]:
+    # Reset headers are either epoch seconds (GitHub) or seconds-from-now (Reddit)
+    if value is None:
+        return None
+    return max(0.0, value - time.time()) if value > 1e9 else max(0.0, value)
+
+
+def retry_after(headers: Mapping[str, str]) -> Optional[float]:
+    raw = headers.get("Retry-After")
+    if not raw:
+        return None
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(raw).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def window(headers: Mapping[str, str]) -> Tuple[Optional[float], Optional[float]]:
+    """
+    (remaining, seconds until reset) from X-RateLimit-* style headers, if present.
+    """
+    remaining = _header_float(headers, "X-RateLimit-Remaining")
+    reset_in = _seconds_until(_header_float(headers, "X-RateLimit-Reset"))
+    return remaining, reset_in
+
+
+def throttle_delay(status: int, headers: Mapping[str, str], data: Any) -> Optional[float]:
+    """
+    Seconds to wait if this response is a rate-limit rejection, else None.
+    Covers 429 + Retry-After, GitHub's 403 with an exhausted X-RateLimit window,
+    and StackExchange's throttle_violation error body.
+    """
+    if status == 429:
+        delay = retry_after(headers)
+        if delay is None:
+            delay = window(headers)[1]
+        return delay if delay is not None else BACKOFF_BASE
+    if status == 403:
+        delay = retry_after(headers)
+        if delay is not None:
+            return delay
+        remaining, reset_in = window(headers)
+        if remaining == 0:
+            return reset_in if reset_in is not None else BACKOFF_BASE
+    if status == 400 and isinstance(data, dict) and data.get("error_name") == "throttle_violation":
+        # "too many requests from this IP, more requests available in N seconds"
+        digits = [int(t) for t in str(data.get("error_message", "")).split() if t.isdigit()]
+        return float(digits[-1]) if digits else 60.0
+    return None
+
+
+class HostScheduler:
+    """
+    One token bucket per provider, fed back by upstream rate-limit signals.
+    """
+
+    def __init__(self, limits: Dict[str, Tuple[float, int]] = RATE_LIMITS,
+                 enabled: bool = ENABLED):
+        self.limits = limits
+        self.enabled = enabled
+        self._buckets: Dict[str, TokenBucket] = {}
+        self.stats: Dict[str, int] = {"throttled": 0, "retries": 0, "gave_up": 0}
+
+    def bucket(self, provider: Optional[str]) -> TokenBucket:
+        key = provider or "default"
+        b = self._buckets.get(key)
+        if b is None:
+            b = self._buckets[key] = TokenBucket(*self.limits.get(key, DEFAULT_RATE_LIMIT))
+        return b
+
+    async def acquire(self, provider: Optional[str], deadline: float) -> bool:
+        b = self.bucket(provider)
+        if self.enabled:
+            return await b.acquire(deadline)
+        # Buckets off: only honour pauses requested by the upstream
+        now = time.monotonic()
+        wait = b.paused_until - now
+        if wait > 0:
+            if now + wait > deadline:
+                return False
+            await asyncio.sleep(wait)
+        return True
+
+    def observe(self, provider: Optional[str], status: int,
+                headers: Mapping[str, str], data: Any) -> Optional[float]:
+        """
+        Feed a response back into the provider's bucket.
+        Returns the delay to wait before retrying if the response was throttled.
+        """
+        b = self.bucket(provider)
+        remaining, reset_in = window(headers)
+        if remaining is not None and reset_in is not None:
+            b.adapt(remaining, reset_in)
+        if isinstance(data, dict) and data.get("backoff"):
+            # StackExchange asks for a pause before the next call to the same method
+            b.pause(float(data["backoff"]))
+
+        delay = throttle_delay(status, headers, data)
+        if delay is not None:
+            self.stats["throttled"] += 1
+            b.pause(jittered(delay))
+        return delay
+
+    def snapshot(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            **self.stats,
+            "buckets": {
+                k: {
+                    "rate": round(b.rate, 4),
+                    "tokens": round(b.tokens, 2),
+                    "paused_for": round(max(0.0, b.paused_until - now), 2),
+                }
+                for k, b in self._buckets.items()
+            },
+        }
+
+
+def backoff(attempt: int) -> float:
+    # Full-jitter exponential backoff for transient upstream errors
+    return random.uniform(0, BACKOFF_BASE * (2 ** attempt))
+
+
+def jittered(delay: float) -> float:
+    # Spread callers out without running much past the server's own reset
+    return delay + random.uniform(0, min(JITTER * delay, MAX_JITTER))
+
+
+SCHEDULER = HostScheduler()
@@ -0,0 +1,30 @@
+import aiohttp
+
+from .providers import DEFAULT_TIMEOUT, HEADERS_JSON
+
+# Connection pool tuning for the process-wide client session.
+POOL_LIMIT = 100            # total open connections across all upstreams
+POOL_LIMIT_PER_HOST = 20    # per upstream host (api.github.com, gitlab.com, ...)
+KEEPALIVE_TIMEOUT = 30      # seconds an idle connection is kept for reuse
+DNS_CACHE_TTL = 300         # seconds a resolved address is cached
+
+
+def create_session(limit: int = POOL_LIMIT,
+                   limit_per_host: int = POOL_LIMIT_PER_HOST) -> aiohttp.ClientSession:
+    """
+    Build the long-lived ClientSession shared by all searches.
+    Must be called from inside the event loop that will use it.
+    """
+    connector = aiohttp.TCPConnector(
+        limit=limit,
+        limit_per_host=limit_per_host,
+        keepalive_timeout=KEEPALIVE_TIMEOUT,
+        ttl_dns_cache=DNS_CACHE_TTL,
+        use_dns_cache=True,
+        enable_cleanup_closed=True,
+    )
+    return aiohttp.ClientSession(
+        connector=connector,
+        headers=HEADERS_JSON,
+        timeout=DEFAULT_TIMEOUT,
+    )
@@ -0,0 +1,46 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable
+
+# Providers whose handles are case-sensitive upstream (HN user ids are).
+CASE_SENSITIVE = {"hackernews"}
+
+
+def flight_key(provider: str, username: str) -> tuple:
+    u = username.strip()
+    return provider, (u if provider in CASE_SENSITIVE else u.lower())
+
+
+class SingleFlight:
+    """
+    Collapse concurrent identical calls into one in-flight task.
+
+    The shared call runs as its own task and callers await it through
+    asyncio.shield, so one caller being cancelled (e.g. an SSE client going
+    away) does not cancel the lookup for the others.
+    """
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.stats: Dict[str, int] = {"calls": 0, "executed": 0, "coalesced": 0}
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        self.stats["calls"] += 1
+        task = self._inflight.get(key)
+        if task is None:
+            self.stats["executed"] += 1
+            task = asyncio.ensure_future(fn())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._forget(k, t))
+        else:
+            self.stats["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+
+    def snapshot(self) -> Dict[str, int]:
+        return {**self.stats, "inflight": len(self._inflight)}
+
+
+FLIGHTS = SingleFlight()